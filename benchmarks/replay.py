@@ -0,0 +1,284 @@
+# coding=utf-8
+
+# FAQ bot for Telegram Messenger
+# Copyright (c) 2019 - 2020 EasyCoding Team
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import argparse
+import json
+import math
+import os
+import shutil
+import signal
+import sqlite3
+import tempfile
+import threading
+import time
+
+from collections import deque
+from types import SimpleNamespace
+from typing import Dict, List
+
+import telebot
+
+from faqbot import FAQBot
+from faqbot.modules.recorder import FAQRecorder
+from faqbot.settings import Settings
+
+
+class FAQReplayBot(telebot.TeleBot):
+    def get_me(self) -> telebot.types.User:
+        """
+        Return fake bot account without calling Telegram API.
+        :return: Bot account.
+        """
+        return telebot.types.User(1, True, 'replay')
+
+    def get_updates(self, offset=None, limit=None, timeout=20, allowed_updates=None) -> list:
+        """
+        Return captured messages, which are due according to their arrival
+        times and replay speed. Send SIGTERM to itself when the capture is
+        over, so the bot finishes all commands and shuts down gracefully.
+        :param offset: Ignored.
+        :param limit: Maximum number of updates.
+        :param timeout: Maximum time to wait for the next message.
+        :param allowed_updates: Ignored.
+        :return: List of updates.
+        """
+        if self.__started is None:
+            self.__started = time.perf_counter()
+        if self.__position >= len(self.__entries):
+            if not self.__finished:
+                self.__finished = True
+                os.kill(os.getpid(), signal.SIGTERM)
+            return []
+        if self.__speed:
+            delay = self.__started + self.__entries[self.__position]['t'] / self.__speed - time.perf_counter()
+            time.sleep(max(min(delay, timeout), 0))
+        now = time.perf_counter()
+        result = []
+        while self.__position < len(self.__entries) and len(result) < (limit or 100):
+            if self.__speed and self.__started + self.__entries[self.__position]['t'] / self.__speed > now:
+                break
+            result.append(self.__create_update(self.__position))
+            self.__arrived[self.__position] = now
+            self.__position += 1
+        return result
+
+    def send_message(self, chat_id, text, reply_to_message_id=None, **kwargs) -> None:
+        """
+        Save reply and its latency instead of sending it. Replies without
+        reply_to_message_id are matched with the oldest unanswered command
+        in the same chat. Ordinary messages are answered only by replies,
+        so they are never matched this way.
+        :param chat_id: Chat ID.
+        :param text: Message text.
+        :param reply_to_message_id: Message ID, this message replies to.
+        """
+        now = time.perf_counter()
+        with self.__lock:
+            index = self.__replied.get(reply_to_message_id, -1)
+            if index < 0:
+                pending = self.__pending.get(chat_id, ())
+                while pending and pending[0] in self.__latency:
+                    pending.popleft()
+                index = pending[0] if pending else -1
+            if index < 0:
+                return
+            self.__replies.setdefault(index, []).append(text)
+            if index not in self.__latency:
+                self.__latency[index] = now - self.__arrived[index]
+
+    def get_chat_member(self, chat_id, user_id) -> SimpleNamespace:
+        """
+        Treat all users as ordinary chat members.
+        :param chat_id: Chat ID.
+        :param user_id: User ID.
+        :return: Chat member.
+        """
+        return SimpleNamespace(status='member')
+
+    def get_results(self) -> tuple:
+        """
+        Get replies and latencies of all answered messages.
+        :return: Replies and latencies by message index.
+        """
+        with self.__lock:
+            return dict(self.__replies), dict(self.__latency)
+
+    def __create_update(self, index: int) -> telebot.types.Update:
+        """
+        Create update from captured message. Messages of admins are sent
+        on behalf of the first admin from configuration. Only commands
+        are queued for matching with replies without reply_to_message_id.
+        Private method.
+        :param index: Message index.
+        :return: Update.
+        """
+        entry = self.__entries[index]
+        userid = self.__admin if entry.get('a') and self.__admin else entry['u']
+        chatid = userid if entry['ct'] == 'private' else entry['c']
+        chat = {'id': chatid, 'type': entry['ct']}
+        message = {'message_id': index + 1, 'date': int(time.time()), 'chat': chat, 'text': entry['x'],
+                   'from': {'id': userid, 'is_bot': False, 'first_name': 'user', 'language_code': entry['l']}}
+        if entry.get('r'):
+            message['reply_to_message'] = {'message_id': len(self.__entries) + index + 1, 'date': 0, 'chat': chat}
+            self.__replied[len(self.__entries) + index + 1] = index
+        self.__replied[index + 1] = index
+        if entry['x'].startswith('/'):
+            with self.__lock:
+                self.__pending.setdefault(chatid, deque()).append(index)
+        return telebot.types.Update.de_json({'update_id': index + 1, 'message': message})
+
+    def __init__(self, entries: List[dict], speed: float, admin: int) -> None:
+        """
+        Main constructor of FAQReplayBot class.
+        :param entries: Captured messages.
+        :param speed: Replay speed multiplier. Zero means maximum speed.
+        :param admin: User ID to use for messages of admins.
+        """
+        super().__init__('replay', threaded=False)
+        self.__entries = entries
+        self.__speed = speed
+        self.__admin = admin
+        self.__lock = threading.Lock()
+        self.__position = 0
+        self.__finished = False
+        self.__arrived: Dict[int, float] = {}
+        self.__replied: Dict[int, int] = {}
+        self.__pending: Dict[int, deque] = {}
+        self.__replies: Dict[int, List[str]] = {}
+        self.__latency: Dict[int, float] = {}
+        self.__started = None
+
+    @property
+    def started(self) -> float:
+        """
+        Get time of the first request for updates.
+        :return: Performance counter value.
+        """
+        return self.__started
+
+
+class ReplayBenchmark:
+    def __prepare_data(self, database: str) -> None:
+        """
+        Copy the database to a temporary data directory, so replay never
+        modifies real data.
+        :param database: Full path to the database.
+        """
+        self.__datapath = tempfile.mkdtemp(prefix='faqbot-replay-')
+        src = sqlite3.connect(database)
+        dst = sqlite3.connect(os.path.join(self.__datapath, 'faqbot.db'))
+        try:
+            src.backup(dst)
+        finally:
+            dst.close()
+            src.close()
+        os.environ['DATAPATH'] = self.__datapath
+        os.environ.pop('RECORD', None)
+        os.environ.setdefault('APIKEY', 'replay')
+
+    @staticmethod
+    def __get_percentile(values: List[float], percent: float) -> float:
+        """
+        Get percentile of sorted values using nearest-rank method.
+        :param values: Sorted values.
+        :param percent: Percentile.
+        :return: Percentile value.
+        """
+        return values[max(math.ceil(percent / 100 * len(values)) - 1, 0)] if values else 0.0
+
+    def run(self, speed: float, parallel: bool = False) -> dict:
+        """
+        Replay the capture and collect replies. By default commands are
+        handled one by one in order of arrival without throttling, so
+        replies do not depend on scheduling and timing.
+        :param speed: Replay speed multiplier. Zero means maximum speed.
+        :param parallel: Use configured worker pool and throttling.
+        :return: Report with throughput, latency percentiles and replies.
+        """
+        if parallel:
+            os.environ.pop('SERIAL', None)
+        else:
+            os.environ['SERIAL'] = '1'
+        admins = Settings(1).admins
+        bot = FAQReplayBot(self.__entries, speed, admins[0] if admins else 0)
+        try:
+            FAQBot(bot).runbot()
+        finally:
+            shutil.rmtree(self.__datapath, ignore_errors=True)
+        elapsed = time.perf_counter() - bot.started
+        replies, latency = bot.get_results()
+        values = sorted(latency.values())
+        return {'updates': len(self.__entries), 'answered': len(latency), 'parallel': parallel, 'elapsed': elapsed,
+                'throughput': len(self.__entries) / elapsed if elapsed else 0.0,
+                'latency': {str(p): self.__get_percentile(values, p) * 1000 for p in (50, 90, 99, 100)},
+                'replies': {str(index): texts for index, texts in sorted(replies.items())}}
+
+    def __init__(self, capture: str, database: str) -> None:
+        """
+        Main constructor of ReplayBenchmark class.
+        :param capture: Full path to capture file.
+        :param database: Full path to the database.
+        """
+        self.__entries = list(FAQRecorder.read(capture))
+        self.__prepare_data(database)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Replay captured traffic against FAQ bot with stubbed sender.')
+    parser.add_argument('capture', help='full path to capture file')
+    parser.add_argument('--speed', type=float, default=1.0, help='replay speed multiplier, 0 for maximum speed')
+    parser.add_argument('--parallel', action='store_true', help='use configured workers and throttling, replies '
+                        'may depend on scheduling')
+    parser.add_argument('--database', help='database to copy for replay (default: configured one)')
+    parser.add_argument('--output', help='save report with replies to JSON file')
+    parser.add_argument('--baseline', help='compare replies with report of the previous run')
+    return parser.parse_args()
+
+
+def print_diff(report: dict, baseline: dict) -> None:
+    expected, actual = baseline['replies'], report['replies']
+    changed = sorted((key for key in set(expected) | set(actual) if expected.get(key) != actual.get(key)), key=int)
+    if baseline.get('parallel') or report['parallel']:
+        print('Parallel mode was used, some differences may be caused by scheduling.')
+    print('Replies differ from baseline for {} of {} updates.'.format(len(changed), report['updates']))
+    for key in changed[:10]:
+        print('  #{}: {!r} -> {!r}'.format(key, expected.get(key), actual.get(key)))
+    print('Throughput: {:+.1f}%, p99 latency: {:+.1f}%.'.format(
+        (report['throughput'] / baseline['throughput'] - 1) * 100 if baseline['throughput'] else 0.0,
+        (report['latency']['99'] / baseline['latency']['99'] - 1) * 100 if baseline['latency']['99'] else 0.0))
+
+
+def main():
+    args = parse_args()
+    benchmark = ReplayBenchmark(args.capture, args.database or Settings(1).database_file)
+    report = benchmark.run(args.speed, args.parallel)
+    print('{} updates, {} answered in {:.3f} s, {:.1f} updates/s.'.format(
+        report['updates'], report['answered'], report['elapsed'], report['throughput']))
+    print('Latency: p50 {:.2f} ms, p90 {:.2f} ms, p99 {:.2f} ms, max {:.2f} ms.'.format(
+        *(report['latency'][key] for key in ('50', '90', '99', '100'))))
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            print_diff(report, json.load(file))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+# coding=utf-8
+
+# FAQ bot for Telegram Messenger
+# Copyright (c) 2019 - 2020 EasyCoding Team
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import time
+
+from types import SimpleNamespace
+
+from faqbot.modules.router import FAQArguments, FAQRouter
+
+
+class RouterBenchmark:
+    def __create_message(self, text: str) -> SimpleNamespace:
+        """
+        Create a minimal message object, compatible with TeleBot one.
+        :param text: Message text.
+        :return: Message object.
+        """
+        return SimpleNamespace(text=text, content_type='text', chat=SimpleNamespace(id=1, type='private'),
+                               from_user=SimpleNamespace(id=1, language_code='en'))
+
+    def __fill_router(self, count: int) -> None:
+        """
+        Add the specified number of commands to the routing table.
+        :param count: Number of commands.
+        """
+        self.__router.add_command('faq', lambda m, p: None, FAQArguments.OPTIONAL)
+        self.__router.add_command('add', lambda m, k, v: None, FAQArguments.PAIR, lambda m: m.chat.type == 'private')
+        for index in range(count):
+            self.__router.add_command('cmd{}'.format(index), lambda m: None, FAQArguments.NONE)
+
+    def run(self, text: str) -> float:
+        """
+        Measure average time of check and dispatch of a single update.
+        :param text: Message text.
+        :return: Time per update in microseconds.
+        """
+        message = self.__create_message(text)
+        started = time.perf_counter()
+        for _ in range(self.__iterations):
+            if self.__router.check(message):
+                self.__router.dispatch(message)
+        return (time.perf_counter() - started) / self.__iterations * 1000000
+
+    def __init__(self, commands: int, iterations: int) -> None:
+        """
+        Main constructor of RouterBenchmark class.
+        :param commands: Number of extra commands in the routing table.
+        :param iterations: Number of updates to dispatch.
+        """
+        self.__iterations = iterations
+        self.__router = FAQRouter(lambda m: None, lambda m: None)
+        self.__fill_router(commands)
+
+
+def main():
+    for commands in (0, 10, 100, 1000):
+        benchmark = RouterBenchmark(commands, 200000)
+        for text in ('/faq keyword', '/add keyword value', '/unknown', 'plain text'):
+            print('{:>5} commands, {:<20} {:.3f} us/update'.format(commands, repr(text), benchmark.run(text)))
+
+
+if __name__ == '__main__':
+    main()
@@ -17,12 +17,31 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import logging
+import re
 import sys
+import threading
 import time
 import telebot
 
-from .modules.helpers import ParamExtractor
+from typing import Callable
+
+from .modules.backup import FAQBackup
 from .modules.database import FAQDatabase
+from .modules.logs import FAQJsonFormatter, FAQLogger
+from .modules.maintenance import FAQMaintenance
+from .modules.matcher import FAQAutoMode, FAQMatcher
+from .modules.profiler import FAQProfiler
+from .modules.recorder import FAQRecorder
+from .modules.router import FAQArguments, FAQLimit, FAQRouter
+from .modules.signals import FAQShutdown, FAQSignals
+from .modules.snapshot import FAQSnapshot
+from .modules.stats import FAQStatistics
+from .modules.storage import FAQRollback
+from .modules.sync import FAQSync
+from .modules.systemd import FAQNotifier
+from .modules.throttle import FAQThrottle
+from .modules.transport import FAQTransport
+from .modules.workers import FAQWorkers
 from .modules.messages import FAQMessages
 from .settings import Settings
 
@@ -44,6 +63,45 @@ class FAQBot:
         """
         return message.chat.type == 'private'
 
+    def __check_group_chat(self, message) -> bool:
+        """
+        Check if message was sent in group chat.
+        :param message: Message to check.
+        :return: Check results.
+        """
+        return message.chat.type in ('group', 'supergroup')
+
+    def __check_chat_admin(self, message) -> bool:
+        """
+        Check if message was sent by bot admin or by administrator of
+        the current chat.
+        :param message: Message to check.
+        :return: Check results.
+        """
+        if message.from_user.id in self.__settings.admins:
+            return True
+        member = self.__bot.get_chat_member(message.chat.id, message.from_user.id)
+        return member.status in ('creator', 'administrator')
+
+    def __check_flood(self, message) -> FAQLimit:
+        """
+        Check if user or chat has exceeded the rate limit of public commands.
+        User's token is returned if the chat limit is exceeded. Cooldown
+        notice is tracked by the exceeded limit only.
+        :param message: Message to check.
+        :return: Check results.
+        """
+        if not self.__userflood.acquire(message.from_user.id):
+            throttle, key = self.__userflood, message.from_user.id
+        elif not self.__chatflood.acquire(message.chat.id):
+            self.__userflood.release(message.from_user.id)
+            throttle, key = self.__chatflood, message.chat.id
+        else:
+            return FAQLimit.ALLOW
+        if self.__settings.floodnotice and throttle.notify(key):
+            return FAQLimit.NOTIFY
+        return FAQLimit.DROP
+
     def __get_dm(self, msgid: str) -> str:
         """
         Get localized string in default language.
@@ -61,15 +119,6 @@ class FAQBot:
         """
         return self.__messages.get_message(msgid, message.from_user.language_code)
 
-    def __extract_value(self, source: str) -> tuple:
-        """
-        Get a keyword and its value from the source string.
-        :param source: Source string.
-        :return: Tuple with keyword and its value.
-        """
-        index = source.index(' ')
-        return source[:index], source[index + 1:]
-
     def __load_messages(self) -> None:
         """
         Create an instance of FAQMessages class.
@@ -92,233 +141,824 @@ class FAQBot:
         self.__logger = logging.getLogger(__name__)
         self.__logger.setLevel(self.__settings.get_logging_level())
         if self.__settings.logtofile:
-            f_handler = logging.FileHandler(self.__settings.logtofile)
-            f_handler.setFormatter(logging.Formatter(self.__settings.fmtlog))
-            self.__logger.addHandler(f_handler)
+            l_handler = logging.FileHandler(self.__settings.logtofile)
+            l_format = self.__settings.fmtlog
         else:
-            e_handler = logging.StreamHandler(sys.stdout)
-            e_handler.setFormatter(logging.Formatter(self.__settings.fmterr))
-            self.__logger.addHandler(e_handler)
+            l_handler = logging.StreamHandler(sys.stdout)
+            l_format = self.__settings.fmterr
+        l_handler.setFormatter(FAQJsonFormatter() if self.__settings.logjson else logging.Formatter(l_format))
+        self.__logqueue = FAQLogger(self.__logger, l_handler, self.__settings.logqueue)
+        self.__logqueue.start()
 
-    def __init_bot(self) -> None:
+    def __init_bot(self, bot: telebot.TeleBot) -> None:
         """
         Initialize internal bot engine by creating an instance
-        of TeleBot class.
+        of TeleBot class. Commands are handled by our own worker
+        pool instead of the internal one. All workers share a single
+        pool of keep-alive connections.
+        :param bot: Existing non-threaded instance of TeleBot class
+        to use instead (e.g. for replaying captured traffic).
+        """
+        self.__workers = FAQWorkers(self.__settings.workers, self.__settings.queuesize,
+                                    self.__settings.adminworkers, self.__settings.get_serial_enabled())
+        self.__transport = FAQTransport(self.__settings.poolsize or
+                                        self.__settings.workers + self.__settings.adminworkers + 2,
+                                        self.__settings.connecttimeout, self.__settings.readtimeout,
+                                        self.__settings.retries)
+        self.__transport.install()
+        self.__statslogged = time.monotonic()
+        self.__bot = bot or telebot.TeleBot(self.__settings.tgkey, threaded=False)
+
+    def __log_stats(self) -> None:
+        """
+        Write connection reuse and worker queue statistics to the log.
         """
-        self.__bot = telebot.TeleBot(self.__settings.tgkey)
+        stats = self.__transport.get_stats()
+        self.__logger.info('Telegram API: %d requests, %d connections opened, %.1f%% reused.',
+                           stats['requests'], stats['connections'], stats['reuse'] * 100)
+        for lane, stats in self.__workers.get_stats(reset=True).items():
+            self.__logger.log(logging.WARNING if stats['rejected'] else logging.INFO,
+                              'Queue %s: depth %d (max %d), %d commands processed, %d rejected, '
+                              'wait %.1f ms (max %.1f ms).', lane, stats['depth'], stats['maxdepth'],
+                              stats['processed'], stats['rejected'], stats['avgwait'] * 1000,
+                              stats['maxwait'] * 1000)
+        self.__statslogged = time.monotonic()
+
+    def __init_notifier(self) -> None:
+        """
+        Create an instance of FAQNotifier class. Long polling timeout
+        must be shorter than systemd watchdog timeout.
+        """
+        self.__notifier = FAQNotifier()
+        self.__offset = None
+        self.__polltimeout = max(int(min(20.0, self.__notifier.watchdog / 3)), 1) if self.__notifier.watchdog else 20
 
     def __init_database(self) -> None:
         """
         Establish connection to the database by creating an
-        instance of FAQDatabase class.
+        instance of FAQDatabase class. If snapshot storage is
+        enabled, all lookups will be served by FAQSnapshot instead.
+        """
+        self.__sqlite = FAQDatabase(self.__settings.database_file, self.__settings.compressthreshold,
+                                    self.__settings.cachesize)
+        self.__sqlite.set_query_callback(self.__profiler.log_query)
+        self.__database = self.__sqlite
+        self.__stats = FAQStatistics(self.__sqlite, self.__settings.statsinterval, self.__settings.statsretention)
+        self.__backup = FAQBackup(self.__settings.database_file, self.__settings.backup_path,
+                                  self.__settings.backupcount, self.__settings.backupcompress,
+                                  self.__settings.backupinterval)
+        self.__maintenance = FAQMaintenance(self.__sqlite, self.__settings.maintinterval,
+                                            self.__settings.analyzechanges, self.__settings.vacuumratio)
+        if self.__settings.storage == 'snapshot':
+            self.__database = FAQSnapshot(self.__sqlite, self.__settings.snapshot_file)
+        self.__sync = FAQSync(self.__database, self.__sqlite)
+        self.__matcher = FAQMatcher(self.__database.list_keywords())
+        self.__chatmodes = self.__sqlite.get_chat_modes()
+
+    def __init_recorder(self) -> None:
+        """
+        Create an instance of FAQRecorder class if traffic recording is
+        requested by environment options.
+        """
+        self.__recorder = None
+        if self.__settings.get_recording_enabled():
+            self.__recorder = FAQRecorder(self.__settings.capture_path, self.__settings.admins,
+                                          lambda text: self.__matcher.find(text, FAQAutoMode.KEYWORDS))
+            self.__logger.warning('Recording incoming updates to %s.', self.__recorder.filename)
+
+    def __update_matcher(self) -> None:
+        """
+        Apply changes of keywords and aliases to the automatic answers
+        matcher.
+        """
+        self.__matcher.sync(self.__database.list_keywords())
+
+    def __init_profiler(self) -> None:
+        """
+        Create an instance of FAQProfiler class and enable it if
+        requested by environment options.
+        """
+        self.__profiler = FAQProfiler(self.__settings.profile_path, self.__settings.get_profiling_rate(),
+                                      self.__settings.get_slow_query_threshold(),
+                                      self.__settings.get_profiling_interval())
+        if self.__settings.get_profiling_enabled():
+            self.__profiler.start()
+
+    def __report_syntax(self, message) -> None:
+        """
+        Report about missing or malformed command arguments.
+        :param message: Message, triggered this event.
+        """
+        self.__bot.send_message(message.chat.id, self.__get_lm('fb_mlreq', message))
+
+    def __report_error(self, message) -> None:
+        """
+        Report about exception, raised by restricted command handler.
+        :param message: Message, triggered this event.
+        """
+        self.__bot.send_message(message.chat.id, self.__get_lm('fb_mlreq', message))
+        self.__logger.exception(self.__get_dm('fb_pmex'))
+
+    def __report_flood(self, message) -> None:
+        """
+        Report about exceeded rate limit of public commands.
+        :param message: Message, triggered this event.
+        """
+        self.__bot.reply_to(message, self.__get_lm('fb_flood', message))
+
+    def __report_start_error(self, message) -> None:
+        """
+        Report about exception, raised by /start command handler.
+        :param message: Message, triggered this event.
+        """
+        self.__logger.exception(self.__get_dm('fb_pmex'))
+
+    def __report_faq_error(self, message) -> None:
+        """
+        Report about exception, raised by /faq command handler.
+        :param message: Message, triggered this event.
+        """
+        self.__logger.exception(self.__get_lm('fb_faqexpt', message))
+        self.__bot.reply_to(message, self.__get_lm('fb_faqerr', message))
+
+    def __handle_start(self, message) -> None:
+        """
+        Handle /start command in private chats.
+        :param message: Message, triggered this event.
+        """
+        self.__bot.send_message(message.chat.id, self.__get_lm('fb_welcome', message), parse_mode='Markdown')
+
+    def __add_keyword(self, message, keyword: str, value: str) -> tuple:
+        """
+        Add a new keyword to the main database.
+        :param message: Message, triggered this event.
+        :param keyword: Keyword to add.
+        :param value: Keyword's description.
+        :return: Tuple with result, reply and log message.
+        """
+        if self.__database.check_exists(keyword):
+            return False, self.__get_lm('fb_addexists', message).format(keyword), None
+        self.__database.add_value(keyword, value)
+        return True, self.__get_lm('fb_addmsg', message).format(keyword), self.__get_dm('fb_addlog').format(
+            message.from_user.first_name, message.from_user.id, keyword)
+
+    def __add_alias(self, message, keyword: str, alias: str) -> tuple:
+        """
+        Add a new alias to existing entry in the main database.
+        :param message: Message, triggered this event.
+        :param keyword: Existing keyword.
+        :param alias: Alias to add.
+        :return: Tuple with result, reply and log message.
+        """
+        if not self.__database.check_exists(keyword) or self.__database.check_exists(alias):
+            return False, self.__get_lm('fb_addexists', message).format(keyword), None
+        self.__database.add_alias(keyword, alias)
+        return True, self.__get_lm('fb_alsaddmsg', message).format(alias, keyword), self.__get_dm(
+            'fb_alsaddlog').format(message.from_user.first_name, message.from_user.id, alias, keyword)
+
+    def __remove_keyword(self, message, keyword: str) -> tuple:
+        """
+        Remove keyword and all its aliases from the main database.
+        :param message: Message, triggered this event.
+        :param keyword: Keyword to remove.
+        :return: Tuple with result, reply and log message.
+        """
+        if not self.__database.check_exists(keyword):
+            return False, self.__get_lm('fb_notexists', message).format(keyword), None
+        self.__database.remove_value(keyword)
+        return True, self.__get_lm('fb_remmsg', message).format(keyword), self.__get_dm('fb_remlog').format(
+            message.from_user.first_name, message.from_user.id, keyword)
+
+    def __remove_alias(self, message, alias: str) -> tuple:
+        """
+        Remove alias from the main database.
+        :param message: Message, triggered this event.
+        :param alias: Alias to remove.
+        :return: Tuple with result, reply and log message.
+        """
+        if not self.__database.check_exists(alias):
+            return False, self.__get_lm('fb_notexists', message).format(alias), None
+        self.__database.remove_alias(alias)
+        return True, self.__get_lm('fb_alsremmsg', message).format(alias), self.__get_dm('fb_alsremlog').format(
+            message.from_user.first_name, message.from_user.id, alias)
+
+    def __edit_keyword(self, message, keyword: str, value: str) -> tuple:
+        """
+        Change keyword's description in the main database.
+        :param message: Message, triggered this event.
+        :param keyword: Keyword to edit.
+        :param value: New keyword's description.
+        :return: Tuple with result, reply and log message.
+        """
+        if not self.__database.check_exists(keyword):
+            return False, self.__get_lm('fb_notexists', message).format(keyword), None
+        self.__database.set_value(keyword, value)
+        return True, self.__get_lm('fb_editmsg', message).format(keyword), self.__get_dm('fb_editlog').format(
+            message.from_user.first_name, message.from_user.id, keyword)
+
+    def __set_variant(self, message, keyword: str, payload: str) -> tuple:
+        """
+        Add or change language variant of keyword's description in the
+        main database.
+        :param message: Message, triggered this event.
+        :param keyword: Keyword to edit.
+        :param payload: Language code and localized description.
+        :return: Tuple with result, reply and log message.
+        """
+        lang, _, value = payload.partition(' ')
+        lang, value = lang.lower(), value.strip()
+        if not value or not self.__langcode.match(lang):
+            return False, self.__get_lm('fb_mlreq', message), None
+        if not self.__database.check_exists(keyword):
+            return False, self.__get_lm('fb_notexists', message).format(keyword), None
+        self.__database.set_variant(keyword, lang, value)
+        return True, self.__get_lm('fb_langsetmsg', message).format(lang, keyword), self.__get_dm(
+            'fb_langsetlog').format(message.from_user.first_name, message.from_user.id, lang, keyword)
+
+    def __remove_variant(self, message, keyword: str, lang: str) -> tuple:
+        """
+        Remove language variant of keyword's description from the main
+        database.
+        :param message: Message, triggered this event.
+        :param keyword: Keyword to edit.
+        :param lang: Language code.
+        :return: Tuple with result, reply and log message.
+        """
+        lang = lang.lower()
+        if not self.__database.check_exists(keyword) or not self.__database.remove_variant(keyword, lang):
+            return False, self.__get_lm('fb_langnotexists', message).format(lang, keyword), None
+        return True, self.__get_lm('fb_langremmsg', message).format(lang, keyword), self.__get_dm(
+            'fb_langremlog').format(message.from_user.first_name, message.from_user.id, lang, keyword)
+
+    def __reply_operation(self, message, result: tuple) -> None:
+        """
+        Log successful database operation and send its result to admin.
+        :param message: Message, triggered this event.
+        :param result: Tuple with result, reply and log message.
+        """
+        success, reply, logmsg = result
+        if success:
+            self.__logger.warning(logmsg)
+            self.__update_matcher()
+        self.__bot.send_message(message.chat.id, reply, parse_mode='Markdown')
+
+    def __get_batch_lines(self, message, payload: str) -> list:
+        """
+        Get batch operations from the message or from attached document.
+        :param message: Message, triggered this event.
+        :param payload: Message text after the command.
+        :return: List of non-empty lines.
+        """
+        if message.content_type == 'document':
+            if message.document.file_size > self.__batchsize:
+                raise ValueError('Attached document is too large.')
+            payload = self.__bot.download_file(self.__bot.get_file(message.document.file_id).file_path).decode('utf-8')
+        result = [line.strip() for line in payload.splitlines() if line.strip()]
+        if not result:
+            raise ValueError('Cannot find operations to apply.')
+        return result
+
+    def __send_long_message(self, chatid: int, text: str) -> None:
+        """
+        Send message, splitting it by lines into several messages if it
+        exceeds Telegram limits.
+        :param chatid: Chat ID.
+        :param text: Message text.
+        """
+        chunk = ''
+        for line in text.splitlines(True):
+            if chunk and len(chunk) + len(line) > self.__msglimit:
+                self.__bot.send_message(chatid, chunk, parse_mode='Markdown')
+                chunk = ''
+            chunk += line
+        if chunk:
+            self.__bot.send_message(chatid, chunk, parse_mode='Markdown')
+
+    def __handle_batch(self, message, payload: str, operation: Callable, arguments: FAQArguments) -> None:
+        """
+        Apply multiple operations from a single admin message in one
+        transaction. If any of them fails, no changes will be made.
+        :param message: Message, triggered this event.
+        :param payload: Message text after the command.
+        :param operation: Operation to apply for each line.
+        :param arguments: Expected operation arguments.
+        """
+        results = []
+        lines = self.__get_batch_lines(message, payload)
+        with self.__database.transaction():
+            for line in lines:
+                try:
+                    results.append(operation(message, *self.__router.parse_arguments(arguments, line)))
+                except ValueError:
+                    results.append((False, self.__get_lm('fb_mlreq', message), None))
+            success = all(result[0] for result in results)
+            if not success:
+                raise FAQRollback()
+        if success:
+            for result in results:
+                self.__logger.warning(result[2])
+            self.__update_matcher()
+        summary = [self.__get_lm('fb_batchok' if success else 'fb_batchfail', message).format(len(results))]
+        for number, result in enumerate(results, 1):
+            summary.append('{}. {} {}'.format(number, '\u2705' if result[0] else '\u274c', result[1]))
+        self.__send_long_message(message.chat.id, '\n'.join(summary))
+
+    def __handle_add(self, message, keyword: str, value: str) -> None:
+        """
+        Handle /add command in private chats. Allow admins to add a new
+        keyword to the main database. Restricted command.
+        :param message: Message, triggered this event.
+        :param keyword: Keyword to add.
+        :param value: Keyword's description.
+        """
+        self.__reply_operation(message, self.__add_keyword(message, keyword, value))
+
+    def __handle_alias_add(self, message, keyword: str, alias: str) -> None:
+        """
+        Handle /alias_add command in private chats. Allow admins to add a new
+        alias to existing entry in the main database. Restricted command.
+        :param message: Message, triggered this event.
+        :param keyword: Existing keyword.
+        :param alias: Alias to add.
+        """
+        self.__reply_operation(message, self.__add_alias(message, keyword, alias))
+
+    def __handle_remove(self, message, keyword: str) -> None:
+        """
+        Handle /remove command in private chats. Allow admins to remove
+        keyword from the main database. Restricted command.
+        :param message: Message, triggered this event.
+        :param keyword: Keyword to remove.
+        """
+        self.__reply_operation(message, self.__remove_keyword(message, keyword))
+
+    def __handle_alias_remove(self, message, alias: str) -> None:
+        """
+        Handle /alias_remove command in private chats. Allow admins to remove
+        aliases from the main database. Restricted command.
+        :param message: Message, triggered this event.
+        :param alias: Alias to remove.
         """
-        self.__database = FAQDatabase(self.__settings.database_file)
+        self.__reply_operation(message, self.__remove_alias(message, alias))
+
+    def __handle_lang_set(self, message, keyword: str, payload: str) -> None:
+        """
+        Handle /lang_set command in private chats. Allow admins to add or
+        change language variants of keyword's description. Restricted
+        command.
+        :param message: Message, triggered this event.
+        :param keyword: Keyword to edit.
+        :param payload: Language code and localized description.
+        """
+        self.__reply_operation(message, self.__set_variant(message, keyword, payload))
+
+    def __handle_lang_remove(self, message, keyword: str, lang: str) -> None:
+        """
+        Handle /lang_remove command in private chats. Allow admins to remove
+        language variants of keyword's description. Restricted command.
+        :param message: Message, triggered this event.
+        :param keyword: Keyword to edit.
+        :param lang: Language code.
+        """
+        self.__reply_operation(message, self.__remove_variant(message, keyword, lang))
+
+    def __handle_edit(self, message, keyword: str, value: str) -> None:
+        """
+        Handle /edit command in private chats. Allow admins to edit keyword's
+        description from the main database. Restricted command.
+        :param message: Message, triggered this event.
+        :param keyword: Keyword to edit.
+        :param value: New keyword's description.
+        """
+        self.__reply_operation(message, self.__edit_keyword(message, keyword, value))
+
+    def __handle_list(self, message) -> None:
+        """
+        Handle /list command in private chats. Allow admins to retrieve the
+        full list of keywords from the main database. Restricted command.
+        :param message: Message, triggered this event.
+        """
+        kwlist = ', '.join(self.__database.list_keywords())
+        self.__bot.send_message(message.chat.id, self.__get_lm('fb_listkw', message).format(kwlist))
+
+    def __handle_profile(self, message, action: str) -> None:
+        """
+        Handle /profile command in private chats. Allow admins to enable or
+        disable profiling and take memory snapshots. Restricted command.
+        :param message: Message, triggered this event.
+        :param action: Requested action.
+        """
+        if action == 'on':
+            self.__profiler.start()
+            self.__bot.send_message(message.chat.id, self.__get_lm('fb_profon', message))
+        elif action == 'off':
+            self.__profiler.stop()
+            self.__bot.send_message(message.chat.id, self.__get_lm('fb_profoff', message))
+        elif action == 'snapshot':
+            if self.__profiler.enabled:
+                self.__bot.send_message(message.chat.id, self.__get_lm('fb_profsnap', message).format(
+                    self.__profiler.take_snapshot()), parse_mode='Markdown')
+            else:
+                self.__bot.send_message(message.chat.id, self.__get_lm('fb_profnotrun', message),
+                                        parse_mode='Markdown')
+        else:
+            self.__report_syntax(message)
+
+    def __handle_backup(self, message) -> None:
+        """
+        Handle /backup command in private chats. Allow admins to create an
+        online backup of the main database. Restricted command.
+        :param message: Message, triggered this event.
+        """
+        backup = self.__backup.create()
+        self.__logger.warning(self.__get_dm('fb_backuplog').format(message.from_user.first_name,
+                                                                   message.from_user.id, backup))
+        self.__bot.send_message(message.chat.id, self.__get_lm('fb_backupmsg', message).format(backup),
+                                parse_mode='Markdown')
+
+    def __handle_sync(self, message) -> None:
+        """
+        Handle /sync command in private chats. Allow admins to synchronize
+        the main database with a directory of Markdown files. Restricted
+        command.
+        :param message: Message, triggered this event.
+        """
+        if not self.__settings.sync_path:
+            self.__bot.send_message(message.chat.id, self.__get_lm('fb_syncoff', message))
+            return
+        started = time.monotonic()
+        try:
+            result = self.__sync.run(self.__settings.sync_path)
+        except ValueError as ex:
+            self.__bot.send_message(message.chat.id, self.__get_lm('fb_syncerr', message).format(ex))
+            return
+        elapsed = (time.monotonic() - started) * 1000
+        if result.added or result.updated or result.removed:
+            self.__update_matcher()
+            self.__logger.warning(self.__get_dm('fb_synclog').format(message.from_user.first_name,
+                                                                     message.from_user.id, *result))
+        self.__bot.send_message(message.chat.id, self.__get_lm('fb_syncmsg', message).format(elapsed, *result))
+
+    def __handle_stats(self, message, hours: str) -> None:
+        """
+        Handle /stats command in private chats. Allow admins to retrieve the
+        most requested and the most missed keywords. Restricted command.
+        :param message: Message, triggered this event.
+        :param hours: Time window in hours.
+        """
+        if hours and not (hours.isdecimal() and int(hours) > 0):
+            self.__report_syntax(message)
+            return
+        hours = int(hours) if hours else 24
+        hits = ', '.join('{} ({})'.format(*row) for row in self.__stats.get_top(True, hours))
+        misses = ', '.join('{} ({})'.format(*row) for row in self.__stats.get_top(False, hours))
+        self.__bot.send_message(message.chat.id, self.__get_lm('fb_stats', message).format(hours, hits, misses))
+
+    def __handle_faq(self, message, keyword: str) -> None:
+        """
+        Handle /faq command in any chats. Search for the specified
+        keyword in the main database. Public command.
+        :param message: Message, triggered this event.
+        :param keyword: Keyword to search.
+        """
+        if keyword:
+            dbvalue = self.__database.get_value(keyword, self.__messages.get_fallback(message.from_user.language_code))
+            self.__stats.count(keyword, dbvalue is not None)
+            msg_text = dbvalue if dbvalue else self.__get_lm('fb_notfound', message)
+            msg_id = message.reply_to_message.message_id if message.reply_to_message else message.message_id
+            self.__bot.send_message(message.chat.id, msg_text, reply_to_message_id=msg_id, parse_mode='Markdown')
+        else:
+            self.__bot.send_message(message.chat.id, self.__get_lm('fb_faqlink', message).format(self.__settings.faqlink))
+
+    def __handle_autofaq(self, message, action: str) -> None:
+        """
+        Handle /autofaq command in group chats. Allow chat administrators
+        to enable automatic answers for all keywords or for hashtags
+        only, or to disable them.
+        :param message: Message, triggered this event.
+        :param action: Requested mode.
+        """
+        modes = {'on': FAQAutoMode.KEYWORDS, 'hashtags': FAQAutoMode.HASHTAGS, 'off': FAQAutoMode.OFF}
+        if action and action not in modes:
+            self.__report_syntax(message)
+            return
+        if action:
+            if not self.__check_chat_admin(message):
+                self.__bot.reply_to(message, self.__get_lm('fb_autodenied', message))
+                return
+            self.__sqlite.set_chat_mode(message.chat.id, modes[action])
+            self.__chatmodes[message.chat.id] = modes[action]
+            self.__logger.warning(self.__get_dm('fb_autolog').format(message.from_user.first_name,
+                                                                     message.from_user.id, message.chat.id, action))
+        mode = self.__chatmodes.get(message.chat.id, FAQAutoMode.OFF)
+        msgid = {FAQAutoMode.KEYWORDS: 'fb_autoon', FAQAutoMode.HASHTAGS: 'fb_autotags'}.get(mode, 'fb_autooff')
+        self.__bot.send_message(message.chat.id, self.__get_lm(msgid, message))
+
+    def __handle_auto(self, message) -> None:
+        """
+        Answer ordinary message in group chat, which mentions a known
+        keyword, if automatic answers are enabled.
+        :param message: Message, triggered this event.
+        """
+        dbvalue = self.__database.get_value(message.faq_keyword,
+                                            self.__messages.get_fallback(message.from_user.language_code))
+        if dbvalue:
+            self.__stats.count(message.faq_keyword, True)
+            self.__bot.send_message(message.chat.id, dbvalue, reply_to_message_id=message.message_id,
+                                    parse_mode='Markdown')
+
+    def __init_throttle(self) -> None:
+        """
+        Create instances of FAQThrottle class for users and chats. The
+        same keyword will be answered automatically only once per
+        cooldown period in every chat. Throttling is disabled in serial
+        mode, because it depends on timing.
+        """
+        serial = self.__settings.get_serial_enabled()
+        userrate = 0 if serial else self.__settings.userrate
+        chatrate = 0 if serial else self.__settings.chatrate
+        autorate = 60 / self.__settings.autocooldown if self.__settings.autocooldown and not serial else 0
+        self.__userflood = FAQThrottle(userrate, self.__settings.userburst, self.__settings.floodsize)
+        self.__chatflood = FAQThrottle(chatrate, self.__settings.chatburst, self.__settings.floodsize)
+        self.__autocooldown = FAQThrottle(autorate, 1, self.__settings.floodsize)
+
+    def __init_router(self) -> None:
+        """
+        Create an instance of FAQRouter class and fill the command
+        table. Every handler is wrapped by the profiler.
+        """
+        self.__router = FAQRouter(self.__report_syntax, self.__report_error, self.__report_flood)
+        profile = self.__profiler.profile
+        owner = self.__check_owner_feature
+        self.__router.add_command('start', profile(self.__handle_start), FAQArguments.NONE,
+                                  check=self.__check_private_chat, onerror=self.__report_start_error,
+                                  limit=self.__check_flood)
+        self.__router.add_command('add', profile(self.__handle_add), FAQArguments.PAIR, check=owner,
+                                  batch=self.__get_batch_handler(self.__add_keyword, FAQArguments.PAIR))
+        self.__router.add_command('alias_add', profile(self.__handle_alias_add), FAQArguments.PAIR, check=owner,
+                                  batch=self.__get_batch_handler(self.__add_alias, FAQArguments.PAIR))
+        self.__router.add_command('remove', profile(self.__handle_remove), FAQArguments.REQUIRED, check=owner,
+                                  batch=self.__get_batch_handler(self.__remove_keyword, FAQArguments.REQUIRED))
+        self.__router.add_command('alias_remove', profile(self.__handle_alias_remove), FAQArguments.REQUIRED,
+                                  check=owner,
+                                  batch=self.__get_batch_handler(self.__remove_alias, FAQArguments.REQUIRED))
+        self.__router.add_command('edit', profile(self.__handle_edit), FAQArguments.PAIR, check=owner,
+                                  batch=self.__get_batch_handler(self.__edit_keyword, FAQArguments.PAIR))
+        self.__router.add_command('lang_set', profile(self.__handle_lang_set), FAQArguments.PAIR, check=owner,
+                                  batch=self.__get_batch_handler(self.__set_variant, FAQArguments.PAIR))
+        self.__router.add_command('lang_remove', profile(self.__handle_lang_remove), FAQArguments.PAIR, check=owner,
+                                  batch=self.__get_batch_handler(self.__remove_variant, FAQArguments.PAIR))
+        self.__router.add_command('list', profile(self.__handle_list), FAQArguments.NONE, check=owner)
+        self.__router.add_command('profile', profile(self.__handle_profile), FAQArguments.OPTIONAL, check=owner)
+        self.__router.add_command('backup', profile(self.__handle_backup), FAQArguments.NONE, check=owner)
+        self.__router.add_command('stats', profile(self.__handle_stats), FAQArguments.OPTIONAL, check=owner)
+        self.__router.add_command('sync', profile(self.__handle_sync), FAQArguments.NONE, check=owner)
+        self.__router.add_command('faq', profile(self.__handle_faq), FAQArguments.OPTIONAL,
+                                  onerror=self.__report_faq_error, limit=self.__check_flood)
+        self.__router.add_command('autofaq', profile(self.__handle_autofaq), FAQArguments.OPTIONAL,
+                                  check=self.__check_group_chat, limit=self.__check_flood)
+        self.__autohandler = profile(self.__handle_auto)
+
+    def __get_batch_handler(self, operation: Callable, arguments: FAQArguments) -> Callable:
+        """
+        Create batch handler for the specified database operation.
+        :param operation: Operation to apply for each line.
+        :param arguments: Expected operation arguments.
+        :return: Batch handler.
+        """
+        def handle_batch(message, payload: str) -> None:
+            self.__handle_batch(message, payload, operation, arguments)
+
+        return self.__profiler.profile(handle_batch)
+
+    def __accept_command(self, message) -> bool:
+        """
+        Check if message contains a known command and count it as
+        in-flight until its handler finishes.
+        :param message: Message to check.
+        :return: Check results.
+        """
+        if not self.__router.check(message):
+            return False
+        with self.__inflight_cond:
+            self.__inflight += 1
+        return True
+
+    def __accept_text(self, message) -> bool:
+        """
+        Check if ordinary message in group chat with enabled automatic
+        answers mentions a known keyword, which is not in cooldown, and
+        count it as in-flight until its handler finishes.
+        :param message: Message to check.
+        :return: Check results.
+        """
+        mode = self.__chatmodes.get(message.chat.id, FAQAutoMode.OFF)
+        if not mode or not message.text or message.text.startswith('/'):
+            return False
+        keyword = self.__matcher.find(message.text, mode)
+        if not keyword or not self.__autocooldown.acquire((message.chat.id, keyword)):
+            return False
+        message.faq_keyword = keyword
+        with self.__inflight_cond:
+            self.__inflight += 1
+        return True
+
+    def __finish_command(self) -> None:
+        """
+        Mark in-flight command as finished.
+        """
+        with self.__inflight_cond:
+            self.__inflight -= 1
+            self.__inflight_cond.notify_all()
+
+    def __run_command(self, message) -> None:
+        """
+        Handle command in a worker thread.
+        :param message: Message, triggered this event.
+        """
+        try:
+            self.__router.dispatch(message)
+        finally:
+            self.__finish_command()
+
+    def __run_auto(self, message) -> None:
+        """
+        Send automatic answer in a worker thread.
+        :param message: Message, triggered this event.
+        """
+        try:
+            self.__autohandler(message)
+        finally:
+            self.__finish_command()
+
+    def __reject_command(self, message) -> None:
+        """
+        Answer with an error message if all workers are busy and the
+        queue is full. Answer is sent by the notice lane, so polling
+        is never blocked. If it is full too, command is silently dropped.
+        :param message: Message, triggered this event.
+        """
+        self.__finish_command()
+        self.__workers.notify(self.__send_rejection, message)
+
+    def __send_rejection(self, message) -> None:
+        """
+        Send an error message about rejected command.
+        :param message: Message, triggered this event.
+        """
+        try:
+            self.__bot.reply_to(message, self.__get_lm('fb_faqerr', message))
+        except Exception:
+            self.__logger.exception('Failed to answer rejected command.')
+
+    def __drain(self) -> bool:
+        """
+        Wait until all in-flight commands are handled.
+        :return: True if all commands were handled before timeout.
+        """
+        with self.__inflight_cond:
+            return self.__inflight_cond.wait_for(lambda: self.__inflight == 0, self.__settings.draintimeout)
+
+    def __reload(self) -> None:
+        """
+        Reload settings, messages, throttling limits and storage caches
+        without restarting bot. If new settings cannot be loaded, the
+        previous ones will be kept.
+        """
+        self.__notifier.notify('RELOADING=1')
+        try:
+            self.__read_settings()
+            self.__load_messages()
+            self.__logger.setLevel(self.__settings.get_logging_level())
+            self.__init_throttle()
+            self.__database.reload()
+            self.__chatmodes = self.__sqlite.get_chat_modes()
+            self.__update_matcher()
+            self.__logger.warning('Configuration has been reloaded.')
+        except Exception:
+            self.__logger.exception('Failed to reload configuration.')
+        self.__notifier.ready()
+
+    def __shutdown(self) -> None:
+        """
+        Drain in-flight commands, acknowledge handled updates, save
+        collected state and stop all background services.
+        """
+        self.__notifier.notify('STOPPING=1')
+        if self.__drain():
+            self.__workers.stop()
+        else:
+            self.__logger.warning('Shutdown timeout exceeded, %d commands were not handled.', self.__inflight)
+        try:
+            if self.__offset:
+                self.__bot.get_updates(offset=self.__offset, limit=1, timeout=0)
+        except Exception:
+            self.__logger.exception('Failed to acknowledge handled updates.')
+        self.__backup.stop()
+        self.__maintenance.stop()
+        self.__stats.stop()
+        try:
+            if self.__sqlite.get_journal_mode() == 'wal':
+                self.__sqlite.run_maintenance('checkpoint')
+        except Exception:
+            self.__logger.exception('Failed to checkpoint the database.')
+        self.__profiler.stop()
+        if self.__recorder:
+            self.__recorder.close()
+        self.__log_stats()
+        self.__transport.close()
+
+    def __poll_updates(self) -> None:
+        """
+        Check API token, notify systemd that bot is ready and fetch
+        updates from Telegram until termination signal is received,
+        sending watchdog pings after each request. Termination signal
+        interrupts only waiting for updates: fetched updates will be
+        acknowledged on the next request only, so they are never lost.
+        """
+        self.__bot.get_me()
+        self.__notifier.ready()
+        while not self.__signals.stopping.is_set():
+            with self.__signals.interruptible():
+                updates = self.__bot.get_updates(offset=self.__offset, timeout=self.__polltimeout)
+            if updates:
+                self.__offset = updates[-1].update_id + 1
+                if self.__recorder:
+                    self.__recorder.record(updates)
+                self.__bot.process_new_updates(updates)
+            self.__notifier.heartbeat(len(updates))
+            if time.monotonic() - self.__statslogged >= 600:
+                self.__log_stats()
+            if self.__signals.check_reload():
+                self.__reload()
 
     def runbot(self) -> None:
         """
-        Run bot forever.
+        Run bot until termination signal is received.
         """
 
-        # Initialize command handlers...
-        @self.__bot.message_handler(func=self.__check_private_chat, commands=['start'])
-        def handle_start(message) -> None:
+        # Initialize command handler...
+        @self.__bot.message_handler(func=self.__accept_command, content_types=['text', 'document'])
+        def handle_command(message) -> None:
             """
-            Handle /start command in private chats.
+            Pass all known commands to the worker pool. Commands of
+            admins use a separate lane.
             :param message: Message, triggered this event.
             """
-            try:
-                self.__bot.send_message(message.chat.id, self.__get_lm('fb_welcome', message), parse_mode='Markdown')
-            except:
-                self.__logger.exception(self.__get_dm('fb_pmex'))
+            if not self.__workers.submit(self.__run_command, message, admin=self.__check_owner_feature(message)):
+                self.__reject_command(message)
 
-        @self.__bot.message_handler(func=self.__check_owner_feature, commands=['add'])
-        def handle_add(message) -> None:
-            """
-            Handle /add command in private chats. Allow admins to add a new
-            keyword to the main database. Restricted command.
-            :param message: Message, triggered this event.
-            """
-            try:
-                swreq = ParamExtractor(message.text)
-                if swreq.index > 0:
-                    kw = self.__extract_value(swreq.param)
-                    if not self.__database.check_exists(kw[0]):
-                        self.__database.add_value(kw[0], kw[1])
-                        self.__logger.warning(
-                            self.__get_dm('fb_addlog').format(message.from_user.first_name, message.from_user.id,
-                                                              kw[0]))
-                        self.__bot.send_message(message.chat.id, self.__get_lm('fb_addmsg', message).format(kw[0]),
-                                                parse_mode='Markdown')
-                    else:
-                        self.__bot.send_message(message.chat.id, self.__get_lm('fb_addexists', message).format(kw[0]),
-                                                parse_mode='Markdown')
-                else:
-                    self.__bot.send_message(message.chat.id, self.__get_lm('fb_mlreq', message))
-            except:
-                self.__bot.send_message(message.chat.id, self.__get_lm('fb_mlreq', message))
-                self.__logger.exception(self.__get_dm('fb_pmex'))
-
-        @self.__bot.message_handler(func=self.__check_owner_feature, commands=['alias_add'])
-        def handle_alias_add(message) -> None:
-            """
-            Handle /alias_add command in private chats. Allow admins to add a new
-            alias to existing entry in the main database. Restricted command.
-            :param message: Message, triggered this event.
-            """
-            try:
-                swreq = ParamExtractor(message.text)
-                if swreq.index > 0:
-                    kw = self.__extract_value(swreq.param)
-                    if self.__database.check_exists(kw[0]) and not self.__database.check_exists(kw[1]):
-                        self.__database.add_alias(kw[0], kw[1])
-                        self.__logger.warning(
-                            self.__get_dm('fb_alsaddlog').format(message.from_user.first_name, message.from_user.id,
-                                                                 kw[1], kw[0]))
-                        self.__bot.send_message(message.chat.id,
-                                                self.__get_lm('fb_alsaddmsg', message).format(kw[1], kw[0]),
-                                                parse_mode='Markdown')
-                    else:
-                        self.__bot.send_message(message.chat.id, self.__get_lm('fb_addexists', message).format(kw[0]),
-                                                parse_mode='Markdown')
-                else:
-                    self.__bot.send_message(message.chat.id, self.__get_lm('fb_mlreq', message))
-            except:
-                self.__bot.send_message(message.chat.id, self.__get_lm('fb_mlreq', message))
-                self.__logger.exception(self.__get_dm('fb_pmex'))
-
-        @self.__bot.message_handler(func=self.__check_owner_feature, commands=['remove'])
-        def handle_remove(message) -> None:
+        # Initialize automatic answers handler...
+        @self.__bot.message_handler(func=self.__accept_text, content_types=['text'])
+        def handle_text(message) -> None:
             """
-            Handle /remove command in private chats. Allow admins to remove
-            keyword from the main database. Restricted command.
+            Pass ordinary messages, which mention known keywords, to the
+            worker pool. They are silently dropped if the queue is full.
             :param message: Message, triggered this event.
             """
-            try:
-                swreq = ParamExtractor(message.text)
-                if swreq.index > 0:
-                    if self.__database.check_exists(swreq.param):
-                        self.__database.remove_value(swreq.param)
-                        self.__logger.warning(
-                            self.__get_dm('fb_remlog').format(message.from_user.first_name, message.from_user.id,
-                                                              swreq.param))
-                        self.__bot.send_message(message.chat.id,
-                                                self.__get_lm('fb_remmsg', message).format(swreq.param),
-                                                parse_mode='Markdown')
-                    else:
-                        self.__bot.send_message(message.chat.id,
-                                                self.__get_lm('fb_notexists', message).format(swreq.param),
-                                                parse_mode='Markdown')
-                else:
-                    self.__bot.send_message(message.chat.id, self.__get_lm('fb_mlreq', message))
-            except:
-                self.__bot.send_message(message.chat.id, self.__get_lm('fb_mlreq', message))
-                self.__logger.exception(self.__get_dm('fb_pmex'))
-
-        @self.__bot.message_handler(func=self.__check_owner_feature, commands=['alias_remove'])
-        def handle_alias_remove(message) -> None:
-            """
-            Handle /alias_remove command in private chats. Allow admins to remove
-            aliases from the main database. Restricted command.
-            :param message: Message, triggered this event.
-            """
-            try:
-                swreq = ParamExtractor(message.text)
-                if swreq.index > 0:
-                    if self.__database.check_exists(swreq.param):
-                        self.__database.remove_alias(swreq.param)
-                        self.__logger.warning(
-                            self.__get_dm('fb_alsremlog').format(message.from_user.first_name, message.from_user.id,
-                                                                 swreq.param))
-                        self.__bot.send_message(message.chat.id,
-                                                self.__get_lm('fb_alsremmsg', message).format(swreq.param),
-                                                parse_mode='Markdown')
-                    else:
-                        self.__bot.send_message(message.chat.id,
-                                                self.__get_lm('fb_notexists', message).format(swreq.param),
-                                                parse_mode='Markdown')
-                else:
-                    self.__bot.send_message(message.chat.id, self.__get_lm('fb_mlreq', message))
-            except:
-                self.__bot.send_message(message.chat.id, self.__get_lm('fb_mlreq', message))
-                self.__logger.exception(self.__get_dm('fb_pmex'))
-
-        @self.__bot.message_handler(func=self.__check_owner_feature, commands=['edit'])
-        def handle_edit(message) -> None:
-            """
-            Handle /edit command in private chats. Allow admins to edit keyword's
-            description from the main database. Restricted command.
-            :param message: Message, triggered this event.
-            """
-            try:
-                swreq = ParamExtractor(message.text)
-                if swreq.index > 0:
-                    kw = self.__extract_value(swreq.param)
-                    if self.__database.check_exists(kw[0]):
-                        self.__database.set_value(kw[0], kw[1])
-                        self.__logger.warning(
-                            self.__get_dm('fb_editlog').format(message.from_user.first_name, message.from_user.id,
-                                                               kw[0]))
-                        self.__bot.send_message(message.chat.id, self.__get_lm('fb_editmsg', message).format(kw[0]),
-                                                parse_mode='Markdown')
-                    else:
-                        self.__bot.send_message(message.chat.id, self.__get_lm('fb_notexists', message).format(kw[0]),
-                                                parse_mode='Markdown')
-                else:
-                    self.__bot.send_message(message.chat.id, self.__get_lm('fb_mlreq', message))
-            except:
-                self.__bot.send_message(message.chat.id, self.__get_lm('fb_mlreq', message))
-                self.__logger.exception(self.__get_dm('fb_pmex'))
-
-        @self.__bot.message_handler(func=self.__check_owner_feature, commands=['list'])
-        def handle_list(message) -> None:
-            """
-            Handle /list command in private chats. Allow admins to retrieve the
-            full list of keywords from the main database. Restricted command.
-            :param message: Message, triggered this event.
-            """
-            try:
-                kwlist = ', '.join(self.__database.list_keywords())
-                self.__bot.send_message(message.chat.id, self.__get_lm('fb_listkw', message).format(kwlist))
-            except:
-                self.__bot.send_message(message.chat.id, self.__get_lm('fb_mlreq', message))
-                self.__logger.exception(self.__get_dm('fb_pmex'))
-
-        @self.__bot.message_handler(func=lambda m: True, commands=['faq'])
-        def handle_faq(message):
-            """
-            Handle /faq command in any chats. Search for the specified
-            keyword in the main database. Public command.
-            :param message: Message, triggered this event.
-            """
-            try:
-                swreq = ParamExtractor(message.text)
-                if swreq.index > 0:
-                    dbvalue = self.__database.get_value(swreq.param)
-                    msg_text = dbvalue if dbvalue else self.__get_lm('fb_notfound', message)
-                    msg_id = message.reply_to_message.message_id if message.reply_to_message else message.message_id
-                    self.__bot.send_message(message.chat.id, msg_text, reply_to_message_id=msg_id,
-                                            parse_mode='Markdown')
-                else:
-                    self.__bot.send_message(message.chat.id,
-                                            self.__get_lm('fb_faqlink', message).format(self.__settings.faqlink))
-            except:
-                self.__logger.exception(self.__get_lm('fb_faqexpt', message))
-                self.__bot.reply_to(message, self.__get_lm('fb_faqerr', message))
-
-        # Run bot forever...
-        while True:
-            try:
-                self.__bot.polling(none_stop=True)
-            except Exception:
-                self.__logger.exception(self.__get_dm('fb_crashed'))
-                time.sleep(30.0)
-
-    def __init__(self) -> None:
+            if not self.__workers.submit(self.__run_auto, message):
+                self.__finish_command()
+
+        # Run bot until termination signal...
+        self.__signals.install()
+        self.__workers.start()
+        self.__stats.start()
+        if self.__settings.maintinterval:
+            self.__maintenance.start()
+        if self.__settings.backupinterval:
+            self.__backup.start()
+        try:
+            while not self.__signals.stopping.is_set():
+                try:
+                    self.__poll_updates()
+                except FAQShutdown:
+                    break
+                except Exception:
+                    self.__logger.exception(self.__get_dm('fb_crashed'))
+                    self.__notifier.sleep(30.0, self.__signals.stopping)
+            self.__shutdown()
+        finally:
+            self.__logqueue.stop()
+
+    def __init__(self, bot: telebot.TeleBot = None) -> None:
         """
         Main constructor of FAQBot class.
+        :param bot: Existing non-threaded instance of TeleBot class to use
+        instead of the new one.
         """
         self.__load_messages()
         self.__read_settings()
         self.__set_logger()
-        self.__init_bot()
+        self.__init_bot(bot)
+        self.__init_profiler()
         self.__init_database()
+        self.__batchsize = 1048576
+        self.__msglimit = 4096
+        self.__langcode = re.compile(r'^[a-z]{2,3}(-[a-z0-9]{1,8})?$')
+        self.__inflight = 0
+        self.__inflight_cond = threading.Condition()
+        self.__signals = FAQSignals()
+        self.__init_throttle()
+        self.__init_router()
+        self.__init_notifier()
+        self.__init_recorder()
@@ -0,0 +1,165 @@
+# coding=utf-8
+
+# FAQ bot for Telegram Messenger
+# Copyright (c) 2019 - 2020 EasyCoding Team
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import glob
+import gzip
+import logging
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+
+from typing import List
+
+
+class FAQBackup:
+    def create(self) -> str:
+        """
+        Create an online backup of the database using SQLite backup API.
+        Pages are copied in small steps, so other connections are never
+        blocked for a long time. Old backups will be rotated. Scheduled
+        and manual backups are never created simultaneously.
+        :return: Full path to the created backup.
+        """
+        with self.__lock:
+            os.makedirs(self.__path, exist_ok=True)
+            started = time.monotonic()
+            result = os.path.join(self.__path, '{}-{}.db'.format(self.__prefix, time.strftime('%Y%m%d-%H%M%S')))
+            fd, tmpfile = tempfile.mkstemp(suffix='.tmp', prefix='.{}.'.format(os.path.basename(result)),
+                                           dir=self.__path)
+            os.close(fd)
+            try:
+                self.__copy_database(self.__dbfile, tmpfile)
+                if self.__compress:
+                    tmpfile = self.__compress_file(tmpfile)
+                    result = '{}.gz'.format(result)
+                os.replace(tmpfile, result)
+            except Exception:
+                for fname in (tmpfile, '{}.gz'.format(tmpfile)):
+                    if os.path.isfile(fname):
+                        os.remove(fname)
+                raise
+            self.__rotate()
+        self.__logger.info('Database backup %s created in %.3f seconds.', result, time.monotonic() - started)
+        return result
+
+    def restore(self, backup: str) -> None:
+        """
+        Restore the database from backup. Bot must not be running.
+        :param backup: Full path to backup file (plain or compressed).
+        """
+        if not backup.endswith('.gz'):
+            self.__copy_database(backup, self.__dbfile)
+            return
+        with tempfile.TemporaryDirectory() as tmpdir:
+            plain = os.path.join(tmpdir, 'restore.db')
+            with gzip.open(backup, 'rb') as src, open(plain, 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            self.__copy_database(plain, self.__dbfile)
+
+    def list_backups(self) -> List[str]:
+        """
+        List available backups, sorted from oldest to newest.
+        :return: List of full paths to backups.
+        """
+        return sorted(glob.glob(os.path.join(self.__path, '{}-*.db*'.format(self.__prefix))))
+
+    def start(self) -> None:
+        """
+        Start background backup thread.
+        """
+        self.__worker.start()
+
+    def stop(self) -> None:
+        """
+        Stop background backup thread.
+        """
+        self.__stop.set()
+        if self.__worker.is_alive():
+            self.__worker.join()
+
+    def __copy_database(self, source: str, destination: str) -> None:
+        """
+        Copy database using SQLite backup API. Private method.
+        :param source: Full path to source database.
+        :param destination: Full path to destination database.
+        """
+        src = sqlite3.connect(source)
+        try:
+            dst = sqlite3.connect(destination)
+            try:
+                src.backup(dst, pages=self.__pages, sleep=self.__sleep)
+            finally:
+                dst.close()
+        finally:
+            src.close()
+
+    @staticmethod
+    def __compress_file(fname: str) -> str:
+        """
+        Compress file using gzip and remove the original. Private method.
+        :param fname: Full path to file.
+        :return: Full path to compressed file.
+        """
+        result = '{}.gz'.format(fname)
+        with open(fname, 'rb') as src, gzip.open(result, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(fname)
+        return result
+
+    def __rotate(self) -> None:
+        """
+        Remove the oldest backups, exceeding the limit. Private method.
+        """
+        backups = self.list_backups()
+        for fname in backups[:max(len(backups) - self.__count, 0)]:
+            os.remove(fname)
+
+    def __backup_worker(self) -> None:
+        """
+        Create backups with the specified interval. Private method.
+        """
+        while not self.__stop.wait(self.__interval):
+            try:
+                self.create()
+            except Exception:
+                self.__logger.exception('Failed to create database backup.')
+
+    def __init__(self, dbfile: str, path: str, count: int, compress: bool, interval: float) -> None:
+        """
+        Main constructor of FAQBackup class.
+        :param dbfile: Full path to SQLite database file.
+        :param path: Directory for backups.
+        :param count: Number of backups to keep.
+        :param compress: Compress backups using gzip.
+        :param interval: Interval between scheduled backups in seconds.
+        """
+        self.__dbfile = dbfile
+        self.__path = path
+        self.__count = max(count, 1)
+        self.__compress = compress
+        self.__interval = interval
+        self.__prefix = os.path.splitext(os.path.basename(dbfile))[0]
+        self.__pages = 64
+        self.__sleep = 0.01
+        self.__lock = threading.Lock()
+        self.__stop = threading.Event()
+        self.__worker = threading.Thread(target=self.__backup_worker, name='faqbot-backup', daemon=True)
+        self.__logger = logging.getLogger(__name__)
@@ -16,21 +16,126 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import contextlib
 import os
 import sqlite3
+import threading
+import time
+import zlib
 
+from collections import OrderedDict
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
-class FAQDatabase:
-    def get_value(self, keyword: str) -> str:
+from .storage import FAQCommonStorage, FAQRollback
+
+
+class FAQDatabase(FAQCommonStorage):
+    @property
+    def dbfile(self) -> str:
+        """
+        Get full path to SQLite database file.
+        :return: Full path to SQLite database file.
+        """
+        return self.__dbfile
+
+    def get_value(self, keyword: str, langs: Sequence[str] = ()) -> Optional[str]:
+        """
+        Get value from database by the specified keyword. The best language
+        variant is resolved in a single query. Found values are cached per
+        keyword and languages. Inside transaction its uncommitted changes
+        are read bypassing the cache.
+        :param keyword: Keyword to search.
+        :param langs: Preferred languages.
+        :return: Value from database or None if not found.
+        """
+        key = keyword, tuple(langs)
+        if self.__check_owner():
+            return self.__get_value(keyword, key[1])
+        with self.__cachelock:
+            if key in self.__cache:
+                self.__cache.move_to_end(key)
+                return self.__cache[key]
+            generation = self.__generation
+        result = self.__get_value(keyword, key[1])
+        if result is not None and self.__cachesize:
+            with self.__cachelock:
+                if generation != self.__generation:
+                    return result
+                self.__cache[key] = result
+                while len(self.__cache) > self.__cachesize:
+                    self.__cache.popitem(last=False)
+        return result
+
+    def __get_value(self, keyword: str, langs: Tuple[str, ...]) -> Optional[str]:
         """
-        Get value from database by the specified keyword.
+        Get value from database by the specified keyword. Variants of
+        preferred languages are joined using the primary key and sorted
+        by preference, so the default value is returned only if none of
+        them exist. Private method.
         :param keyword: Keyword to search.
-        :return: Value from database.
+        :param langs: Preferred languages.
+        :return: Value from database or None if not found.
+        """
+        if langs:
+            cursor = self.__execute('SELECT COALESCE("Variants"."Data", "Values"."Data") FROM "Keys" INNER JOIN '
+                                    '"Values" ON "Values"."ID" = "Keys"."ExtValue" LEFT JOIN "Variants" ON '
+                                    '"Variants"."Value" = "Values"."ID" AND "Variants"."Lang" IN ({}) WHERE '
+                                    '"Keys"."Keyword" = ? ORDER BY CASE "Variants"."Lang" {} ELSE {} END LIMIT 1;'.format(
+                                        ', '.join('?' * len(langs)),
+                                        ' '.join('WHEN ? THEN {}'.format(index) for index in range(len(langs))),
+                                        len(langs)), langs + (keyword,) + langs, reader=True)
+        else:
+            cursor = self.__execute('SELECT "Values"."Data" FROM "Keys" INNER JOIN "Values" ON "Values"."ID" = '
+                                    '"Keys"."ExtValue" WHERE "Keys"."Keyword" = ?;', (keyword,), reader=True)
+        result = cursor.fetchone()
+        return self.__decode_value(result[0]) if result else None
+
+    def __encode_value(self, value: str):
+        """
+        Compress value if it exceeds the size threshold and compression
+        actually saves space. Compressed values are stored as BLOBs, so
+        plain and compressed rows can be mixed. Private method.
+        :param value: Value to encode.
+        :return: Original string or compressed bytes.
+        """
+        if not self.__compress:
+            return value
+        data = value.encode('utf-8')
+        if len(data) < self.__compress:
+            return value
+        packed = zlib.compress(data, 9)
+        return packed if len(packed) < len(data) else value
+
+    @staticmethod
+    def __decode_value(data) -> str:
+        """
+        Decompress value if it was stored compressed. Private method.
+        :param data: Stored string or compressed bytes.
+        :return: Value.
+        """
+        return data if isinstance(data, str) else zlib.decompress(data).decode('utf-8')
+
+    def __clear_cache(self) -> None:
+        """
+        Drop all cached values. Called after every committed change,
+        because a single change can affect several keywords and languages.
+        Values, which are being read meanwhile, will not be cached. Private
+        method.
         """
-        cursor = self.__connection.cursor()
-        cursor.execute('SELECT "Values"."Data" FROM "Keys" INNER JOIN "Values" ON "Values"."ID" = "Keys"."ExtValue"'
-                       'WHERE "Keys"."Keyword" = ?;', (keyword,))
-        return cursor.fetchone()
+        with self.__cachelock:
+            self.__generation += 1
+            self.__cache.clear()
+
+    def __bump_generation(self) -> None:
+        """
+        Increment content generation, stored in the database. Called by
+        all methods, changing keywords, values or their variants, inside
+        the same transaction. Cache will be dropped after commit. Private
+        method.
+        """
+        self.__changed = True
+        self.__execute('INSERT INTO "Meta" ("Name", "Value") VALUES (?, 1) ON CONFLICT ("Name") DO UPDATE SET '
+                       '"Value" = "Value" + 1;', ('generation',))
 
     def check_exists(self, keyword: str) -> bool:
         """
@@ -38,8 +143,7 @@ class FAQDatabase:
         :param keyword: Keyword to check.
         :return: Return True if exists.
         """
-        cursor = self.__connection.cursor()
-        cursor.execute('SELECT COUNT(*) FROM "Keys" WHERE "Keys"."Keyword" = ?;', (keyword,))
+        cursor = self.__execute('SELECT COUNT(*) FROM "Keys" WHERE "Keys"."Keyword" = ?;', (keyword,), reader=True)
         return cursor.fetchone()[0] > 0
 
     def __get_internal_id(self, keyword: str) -> int:
@@ -48,8 +152,7 @@ class FAQDatabase:
         :param keyword: Keyword to check.
         :return: Internal id.
         """
-        cursor = self.__connection.cursor()
-        cursor.execute('SELECT "Keys"."ExtValue" FROM "Keys" WHERE "Keys"."Keyword" = ?;', (keyword,))
+        cursor = self.__execute('SELECT "Keys"."ExtValue" FROM "Keys" WHERE "Keys"."Keyword" = ?;', (keyword,))
         result = cursor.fetchone()
         if not result:
             raise Exception('The required keyword does not exists in the database.')
@@ -61,8 +164,10 @@ class FAQDatabase:
         :param keyword: Keyword to operate with.
         :param new_value: New value.
         """
-        cursor = self.__connection.cursor()
-        cursor.execute('UPDATE "Values" SET "Data" = ? WHERE "ID" = ?;', (new_value, self.__get_internal_id(keyword)))
+        kwid = self.__get_internal_id(keyword)
+        self.__execute('UPDATE "Values" SET "Data" = ? WHERE "ID" = ?;', (self.__encode_value(new_value), kwid))
+        self.__bump_generation()
+        self.__commit_database_changes()
 
     def __add_value(self, keyword: str, value: str) -> None:
         """
@@ -70,9 +175,9 @@ class FAQDatabase:
         :param keyword: Keyword to operate with.
         :param value: New value.
         """
-        cursor = self.__connection.cursor()
-        cursor.execute('INSERT INTO "Values" ("ID", "Data") VALUES (NULL, ?);', (value,))
-        cursor.execute('INSERT INTO "Keys" ("ID", "Keyword", "ExtValue") VALUES (NULL, ?, ?);', (keyword, cursor.lastrowid))
+        cursor = self.__execute('INSERT INTO "Values" ("ID", "Data") VALUES (NULL, ?);', (self.__encode_value(value),))
+        self.__execute('INSERT INTO "Keys" ("ID", "Keyword", "ExtValue") VALUES (NULL, ?, ?);', (keyword, cursor.lastrowid))
+        self.__bump_generation()
         self.__commit_database_changes()
 
     def __remove_value(self, keyword: str) -> None:
@@ -82,9 +187,10 @@ class FAQDatabase:
         """
         kwid = self.__get_internal_id(keyword)
         if kwid > 0:
-            cursor = self.__connection.cursor()
-            cursor.execute('DELETE FROM "Keys" WHERE "ExtValue" = ?;', (kwid,))
-            cursor.execute('DELETE FROM "Values" WHERE "ID" = ?;', (kwid,))
+            self.__execute('DELETE FROM "Keys" WHERE "ExtValue" = ?;', (kwid,))
+            self.__execute('DELETE FROM "Variants" WHERE "Value" = ?;', (kwid,))
+            self.__execute('DELETE FROM "Values" WHERE "ID" = ?;', (kwid,))
+            self.__bump_generation()
             self.__commit_database_changes()
 
     def __check_if_orphaned(self, kwid: int) -> bool:
@@ -93,8 +199,7 @@ class FAQDatabase:
         :param kwid: Value ID.
         :return: Return True if orphaned.
         """
-        cursor = self.__connection.cursor()
-        cursor.execute('SELECT COUNT(*) FROM "Keys" WHERE "Keys"."ExtValue" = ?;', (kwid,))
+        cursor = self.__execute('SELECT COUNT(*) FROM "Keys" WHERE "Keys"."ExtValue" = ?;', (kwid,))
         return cursor.fetchone()[0] == 0
 
     def __remove_alias(self, alias: str) -> None:
@@ -104,10 +209,11 @@ class FAQDatabase:
         """
         kwid = self.__get_internal_id(alias)
         if kwid > 0:
-            cursor = self.__connection.cursor()
-            cursor.execute('DELETE FROM "Keys" WHERE "Keyword" = ?;', (alias,))
+            self.__execute('DELETE FROM "Keys" WHERE "Keyword" = ?;', (alias,))
             if self.__check_if_orphaned(kwid):
-                cursor.execute('DELETE FROM "Values" WHERE "ID" = ?;', (kwid,))
+                self.__execute('DELETE FROM "Variants" WHERE "Value" = ?;', (kwid,))
+                self.__execute('DELETE FROM "Values" WHERE "ID" = ?;', (kwid,))
+            self.__bump_generation()
             self.__commit_database_changes()
 
     def __add_alias(self, keyword: str, new_alias: str) -> None:
@@ -118,8 +224,8 @@ class FAQDatabase:
         """
         kwid = self.__get_internal_id(keyword)
         if kwid > 0:
-            cursor = self.__connection.cursor()
-            cursor.execute('INSERT INTO "Keys" ("ID", "Keyword", "ExtValue") VALUES (NULL, ?, ?);', (new_alias, kwid))
+            self.__execute('INSERT INTO "Keys" ("ID", "Keyword", "ExtValue") VALUES (NULL, ?, ?);', (new_alias, kwid))
+            self.__bump_generation()
             self.__commit_database_changes()
 
     def __list_keywords(self) -> list:
@@ -127,19 +233,153 @@ class FAQDatabase:
         List all available keywords from the database. Private method.
         """
         result = []
-        cursor = self.__connection.cursor()
-        cursor.execute('SELECT "Keyword" FROM "Keys";')
+        cursor = self.__execute('SELECT "Keyword" FROM "Keys";', reader=True)
         for keyword in cursor.fetchall():
             result.append(keyword[0])
         return result
 
+    def __list_values(self) -> List[Tuple[str, int, str]]:
+        """
+        List all available keywords with internal IDs and values. Private
+        method.
+        :return: List of tuples with keyword, internal ID and value.
+        """
+        cursor = self.__execute('SELECT "Keys"."Keyword", "Values"."ID", "Values"."Data" FROM "Keys" INNER JOIN '
+                                '"Values" ON "Values"."ID" = "Keys"."ExtValue";', reader=True)
+        return [(keyword, valueid, self.__decode_value(data)) for keyword, valueid, data in cursor.fetchall()]
+
+    def __set_variant(self, keyword: str, lang: str, value: str) -> None:
+        """
+        Add or change language variant of the specified keyword's value.
+        Private method.
+        :param keyword: Keyword to operate with.
+        :param lang: Language code.
+        :param value: Localized value.
+        """
+        self.__execute('INSERT INTO "Variants" ("Value", "Lang", "Data") VALUES (?, ?, ?) ON CONFLICT ("Value", '
+                       '"Lang") DO UPDATE SET "Data" = "excluded"."Data";',
+                       (self.__get_internal_id(keyword), lang, self.__encode_value(value)))
+        self.__bump_generation()
+        self.__commit_database_changes()
+
+    def __remove_variant(self, keyword: str, lang: str) -> bool:
+        """
+        Remove language variant of the specified keyword's value. Private
+        method.
+        :param keyword: Keyword to operate with.
+        :param lang: Language code.
+        :return: Return True if variant was removed.
+        """
+        cursor = self.__execute('DELETE FROM "Variants" WHERE "Value" = ? AND "Lang" = ?;',
+                                (self.__get_internal_id(keyword), lang))
+        self.__bump_generation()
+        self.__commit_database_changes()
+        return cursor.rowcount > 0
+
+    def __list_variants(self) -> List[Tuple[int, str, str]]:
+        """
+        List all language variants with internal IDs of their values.
+        Private method.
+        :return: List of tuples with internal ID, language and value.
+        """
+        cursor = self.__execute('SELECT "Value", "Lang", "Data" FROM "Variants";', reader=True)
+        return [(valueid, lang, self.__decode_value(data)) for valueid, lang, data in cursor.fetchall()]
+
+    def __add_statistics(self, rows: List[Tuple[str, bool, int, int]]) -> None:
+        """
+        Add lookup counters to the statistics table in a single
+        transaction. Private method.
+        :param rows: List of tuples with keyword, lookup result, period and count.
+        """
+        for row in rows:
+            self.__execute('INSERT INTO "Stats" ("Keyword", "Found", "Period", "Count") VALUES (?, ?, ?, ?) ON '
+                           'CONFLICT ("Keyword", "Found", "Period") DO UPDATE SET "Count" = "Count" + '
+                           '"excluded"."Count";', row)
+        self.__commit_database_changes()
+
+    def __remove_statistics(self, before: int) -> int:
+        """
+        Remove lookup counters of periods, started before the specified
+        time. Private method.
+        :param before: Unix timestamp.
+        :return: Number of removed rows.
+        """
+        cursor = self.__execute('DELETE FROM "Stats" WHERE "Period" < ?;', (before,))
+        self.__commit_database_changes()
+        return cursor.rowcount
+
+    def __set_chat_mode(self, chatid: int, mode: int) -> None:
+        """
+        Set automatic answers mode of the specified chat. Private method.
+        :param chatid: Chat ID.
+        :param mode: Automatic answers mode.
+        """
+        self.__execute('INSERT INTO "Chats" ("ChatID", "Mode") VALUES (?, ?) ON CONFLICT ("ChatID") DO UPDATE SET '
+                       '"Mode" = "excluded"."Mode";', (chatid, mode))
+        self.__commit_database_changes()
+
+    def __get_chat_modes(self) -> Dict[int, int]:
+        """
+        Get automatic answers modes of all chats. Private method.
+        :return: Dictionary with chat IDs and modes.
+        """
+        cursor = self.__execute('SELECT "Chats"."ChatID", "Chats"."Mode" FROM "Chats";')
+        return dict(cursor.fetchall())
+
+    def __set_sync_state(self, path: str, mtime: int, size: int, digest: str, keywords: List[str]) -> None:
+        """
+        Save state of synchronized file. Private method.
+        :param path: Relative path to file.
+        :param mtime: Modification time in nanoseconds.
+        :param size: File size.
+        :param digest: Content hash.
+        :param keywords: Keyword and aliases, defined by this file.
+        """
+        self.__execute('INSERT INTO "Files" ("Path", "MTime", "Size", "Hash", "Keywords") VALUES (?, ?, ?, ?, ?) ON '
+                       'CONFLICT ("Path") DO UPDATE SET "MTime" = "excluded"."MTime", "Size" = "excluded"."Size", '
+                       '"Hash" = "excluded"."Hash", "Keywords" = "excluded"."Keywords";',
+                       (path, mtime, size, digest, '\n'.join(keywords)))
+        self.__commit_database_changes()
+
+    def __remove_sync_state(self, path: str) -> None:
+        """
+        Remove state of synchronized file. Private method.
+        :param path: Relative path to file.
+        """
+        self.__execute('DELETE FROM "Files" WHERE "Path" = ?;', (path,))
+        self.__commit_database_changes()
+
+    def __get_sync_state(self) -> Dict[str, Tuple[int, int, str, List[str]]]:
+        """
+        Get states of all synchronized files. Private method.
+        :return: Dictionary with relative paths and tuples with
+        modification time, size, content hash and keywords.
+        """
+        cursor = self.__execute('SELECT "Path", "MTime", "Size", "Hash", "Keywords" FROM "Files";')
+        return {row[0]: (row[1], row[2], row[3], row[4].split('\n')) for row in cursor.fetchall()}
+
+    def __get_statistics(self, found: bool, since: int, limit: int) -> List[Tuple[str, int]]:
+        """
+        Get the most requested keywords from the statistics table. Private
+        method.
+        :param found: Get successful (True) or failed (False) lookups.
+        :param since: Start of the time window as Unix timestamp.
+        :param limit: Maximum number of keywords.
+        :return: List of tuples with keyword and number of lookups.
+        """
+        cursor = self.__execute('SELECT "Keyword", SUM("Count") AS "Total" FROM "Stats" WHERE "Found" = ? AND '
+                                '"Period" >= ? GROUP BY "Keyword" ORDER BY "Total" DESC LIMIT ?;',
+                                (found, since, limit))
+        return cursor.fetchall()
+
     def add_value(self, keyword: str, value: str) -> None:
         """
         Set value for the specified keyword.
         :param keyword: Keyword to operate with.
         :param value: New value.
         """
-        self.__add_value(keyword, value)
+        with self.__lock:
+            self.__add_value(keyword, value)
 
     def set_value(self, keyword: str, new_value: str) -> None:
         """
@@ -147,14 +387,16 @@ class FAQDatabase:
         :param keyword: Keyword to operate with.
         :param new_value: New value.
         """
-        self.__set_value(keyword, new_value)
+        with self.__lock:
+            self.__set_value(keyword, new_value)
 
     def remove_value(self, keyword: str) -> None:
         """
         Remove keyboard from the database.
         :param keyword: Keyword to operate with.
         """
-        self.__remove_value(keyword)
+        with self.__lock:
+            self.__remove_value(keyword)
 
     def add_alias(self, keyword: str, new_alias: str) -> None:
         """
@@ -162,14 +404,16 @@ class FAQDatabase:
         :param keyword: Keyword to operate with.
         :param new_alias: New alias.
         """
-        self.__add_alias(keyword, new_alias)
+        with self.__lock:
+            self.__add_alias(keyword, new_alias)
 
     def remove_alias(self, alias: str) -> None:
         """
         Remove alias from the database.
         :param alias: Alias to operate with.
         """
-        self.__remove_alias(alias)
+        with self.__lock:
+            self.__remove_alias(alias)
 
     def list_keywords(self) -> list:
         """
@@ -177,11 +421,255 @@ class FAQDatabase:
         """
         return self.__list_keywords()
 
+    def list_values(self) -> List[Tuple[str, int, str]]:
+        """
+        List all available keywords with internal IDs and values.
+        :return: List of tuples with keyword, internal ID and value.
+        """
+        return self.__list_values()
+
+    def set_variant(self, keyword: str, lang: str, value: str) -> None:
+        """
+        Add or change language variant of the specified keyword's value.
+        :param keyword: Keyword to operate with.
+        :param lang: Language code.
+        :param value: Localized value.
+        """
+        with self.__lock:
+            self.__set_variant(keyword, lang, value)
+
+    def remove_variant(self, keyword: str, lang: str) -> bool:
+        """
+        Remove language variant of the specified keyword's value.
+        :param keyword: Keyword to operate with.
+        :param lang: Language code.
+        :return: Return True if variant was removed.
+        """
+        with self.__lock:
+            return self.__remove_variant(keyword, lang)
+
+    def list_variants(self) -> List[Tuple[int, str, str]]:
+        """
+        List all language variants with internal IDs of their values.
+        :return: List of tuples with internal ID, language and value.
+        """
+        return self.__list_variants()
+
+    def add_statistics(self, rows: List[Tuple[str, bool, int, int]]) -> None:
+        """
+        Add lookup counters to the statistics table in a single
+        transaction.
+        :param rows: List of tuples with keyword, lookup result, period and count.
+        """
+        with self.__lock:
+            self.__add_statistics(rows)
+
+    def get_statistics(self, found: bool, since: int, limit: int) -> List[Tuple[str, int]]:
+        """
+        Get the most requested keywords from the statistics table.
+        :param found: Get successful (True) or failed (False) lookups.
+        :param since: Start of the time window as Unix timestamp.
+        :param limit: Maximum number of keywords.
+        :return: List of tuples with keyword and number of lookups.
+        """
+        return self.__get_statistics(found, since, limit)
+
+    def remove_statistics(self, before: int) -> int:
+        """
+        Remove old lookup counters from the statistics table.
+        :param before: Remove periods, started before this Unix timestamp.
+        :return: Number of removed rows.
+        """
+        with self.__lock:
+            return self.__remove_statistics(before)
+
+    def set_chat_mode(self, chatid: int, mode: int) -> None:
+        """
+        Set automatic answers mode of the specified chat.
+        :param chatid: Chat ID.
+        :param mode: Automatic answers mode.
+        """
+        with self.__lock:
+            self.__set_chat_mode(chatid, mode)
+
+    def get_chat_modes(self) -> Dict[int, int]:
+        """
+        Get automatic answers modes of all chats.
+        :return: Dictionary with chat IDs and modes.
+        """
+        return self.__get_chat_modes()
+
+    def set_sync_state(self, path: str, mtime: int, size: int, digest: str, keywords: List[str]) -> None:
+        """
+        Save state of synchronized file.
+        :param path: Relative path to file.
+        :param mtime: Modification time in nanoseconds.
+        :param size: File size.
+        :param digest: Content hash.
+        :param keywords: Keyword and aliases, defined by this file.
+        """
+        with self.__lock:
+            self.__set_sync_state(path, mtime, size, digest, keywords)
+
+    def remove_sync_state(self, path: str) -> None:
+        """
+        Remove state of synchronized file.
+        :param path: Relative path to file.
+        """
+        with self.__lock:
+            self.__remove_sync_state(path)
+
+    def get_sync_state(self) -> Dict[str, Tuple[int, int, str, List[str]]]:
+        """
+        Get states of all synchronized files.
+        :return: Dictionary with relative paths and tuples with
+        modification time, size, content hash and keywords.
+        """
+        return self.__get_sync_state()
+
+    @property
+    def idle_time(self) -> float:
+        """
+        Get time in seconds since the last executed SQL query.
+        :return: Idle time.
+        """
+        return time.monotonic() - self.__lastquery
+
+    @property
+    def generation(self) -> int:
+        """
+        Get content generation of the database. It is incremented by every
+        change of keywords, values or their variants, made by any process,
+        and is not affected by service tables.
+        :return: Content generation.
+        """
+        result = self.__execute('SELECT "Value" FROM "Meta" WHERE "Name" = ?;', ('generation',),
+                                reader=True).fetchone()
+        return result[0] if result else 0
+
+    def get_page_stats(self) -> Tuple[int, int, int]:
+        """
+        Get database page statistics.
+        :return: Tuple with page size, number of pages and number of free pages.
+        """
+        return tuple(self.__execute('PRAGMA {};'.format(pragma)).fetchone()[0]
+                     for pragma in ('page_size', 'page_count', 'freelist_count'))
+
+    def get_journal_mode(self) -> str:
+        """
+        Get current journal mode of the database.
+        :return: Journal mode.
+        """
+        return self.__execute('PRAGMA journal_mode;').fetchone()[0]
+
+    def run_maintenance(self, operation: str) -> None:
+        """
+        Run database maintenance operation. Supported operations:
+        analyze, optimize, checkpoint and vacuum.
+        :param operation: Operation name.
+        """
+        queries = {
+            'analyze': 'ANALYZE;',
+            'optimize': 'PRAGMA optimize;',
+            'checkpoint': 'PRAGMA wal_checkpoint(TRUNCATE);',
+            'vacuum': 'VACUUM;'
+        }
+        with self.__lock:
+            self.__execute(queries[operation]).fetchall()
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Run all changes, made inside this context, in a single transaction.
+        Changes will be committed on exit or rolled back if an exception
+        was raised. FAQRollback exception will be suppressed by the outer
+        transaction. Nested transactions are merged with the outer one.
+        """
+        with self.__lock:
+            self.__transaction += 1
+            self.__owner = threading.get_ident()
+            try:
+                yield
+            except Exception as ex:
+                if self.__transaction > 1:
+                    raise
+                self.__connection.rollback()
+                self.__changed = False
+                if not isinstance(ex, FAQRollback):
+                    raise
+            else:
+                if self.__transaction == 1:
+                    self.__commit()
+            finally:
+                self.__transaction -= 1
+                if not self.__transaction:
+                    self.__owner = None
+
+    def reload(self) -> None:
+        """
+        Drop all cached values, so changes, made by other processes, will
+        be read from the database.
+        """
+        self.__clear_cache()
+
+    def set_query_callback(self, callback: Callable[[str, tuple, float], None]) -> None:
+        """
+        Set callback, which will be called after each executed SQL query
+        with the query, its parameters and execution time in seconds.
+        :param callback: Callback function.
+        """
+        self.__callback = callback
+
+    def __check_owner(self) -> bool:
+        """
+        Check if the current thread runs a transaction. Private method.
+        :return: Return True if transaction is owned by the current thread.
+        """
+        return self.__owner == threading.get_ident()
+
+    def __get_reader(self) -> sqlite3.Connection:
+        """
+        Get read-only connection of the current thread. Readers never see
+        uncommitted changes of the running transaction, except the thread,
+        which runs it. Private method.
+        :return: Database connection.
+        """
+        if self.__check_owner():
+            return self.__connection
+        connection = getattr(self.__local, 'connection', None)
+        if not connection:
+            connection = sqlite3.connect(self.__dbfile, check_same_thread=False)
+            with self.__cachelock:
+                self.__readers.append(connection)
+            self.__local.connection = connection
+        return connection
+
+    def __execute(self, query: str, params: tuple = (), reader: bool = False) -> sqlite3.Cursor:
+        """
+        Execute SQL query and measure its execution time. Private method.
+        :param query: SQL query.
+        :param params: Query parameters.
+        :param reader: Use read-only connection of the current thread.
+        :return: Cursor with results.
+        """
+        cursor = (self.__get_reader() if reader else self.__connection).cursor()
+        self.__lastquery = time.monotonic()
+        if not self.__callback:
+            cursor.execute(query, params)
+            return cursor
+        started = time.perf_counter()
+        cursor.execute(query, params)
+        self.__callback(query, params, time.perf_counter() - started)
+        return cursor
+
     def __connect_to_database(self) -> None:
         """
-        Create a database connection. Private method.
+        Create a database connection. Write-ahead logging is enabled, so
+        readers are never blocked by the running transaction. Private
+        method.
         """
         self.__connection = sqlite3.connect(self.__dbfile, check_same_thread=False)
+        self.__connection.execute('PRAGMA journal_mode=WAL;').fetchall()
 
     def __create_database_file(self) -> None:
         """
@@ -192,9 +680,34 @@ class FAQDatabase:
 
     def __commit_database_changes(self) -> None:
         """
-        Save staged changes to file. Private method.
+        Save staged changes to file. Inside transaction changes will be
+        saved on its exit. Private method.
+        """
+        if not self.__transaction:
+            self.__commit()
+
+    def __commit(self) -> None:
+        """
+        Commit changes and drop cached values if keywords or values were
+        changed. Readers use separate connections and see changes only
+        after commit. Private method.
         """
         self.__connection.commit()
+        if self.__changed:
+            self.__changed = False
+            self.__clear_cache()
+
+    def __create_service_tables(self) -> None:
+        """
+        Add service tables, missing in databases, created by previous
+        versions. Private method.
+        """
+        self.__execute('CREATE TABLE IF NOT EXISTS "Stats" ("Keyword" TEXT NOT NULL, "Found" INTEGER NOT NULL, "Period" INTEGER NOT NULL, "Count" INTEGER NOT NULL, PRIMARY KEY ("Keyword", "Found", "Period"));')
+        self.__execute('CREATE TABLE IF NOT EXISTS "Chats" ("ChatID" INTEGER PRIMARY KEY, "Mode" INTEGER NOT NULL);')
+        self.__execute('CREATE TABLE IF NOT EXISTS "Variants" ("Value" INTEGER NOT NULL, "Lang" TEXT NOT NULL, "Data" TEXT NOT NULL, PRIMARY KEY ("Value", "Lang"), FOREIGN KEY("Value") REFERENCES "Values"("ID")) WITHOUT ROWID;')
+        self.__execute('CREATE TABLE IF NOT EXISTS "Files" ("Path" TEXT PRIMARY KEY, "MTime" INTEGER NOT NULL, "Size" INTEGER NOT NULL, "Hash" TEXT NOT NULL, "Keywords" TEXT NOT NULL);')
+        self.__execute('CREATE TABLE IF NOT EXISTS "Meta" ("Name" TEXT PRIMARY KEY, "Value" INTEGER NOT NULL);')
+        self.__commit_database_changes()
 
     def __create_database_and_connect(self) -> None:
         """
@@ -203,24 +716,42 @@ class FAQDatabase:
         """
         self.__create_database_file()
         self.__connect_to_database()
-        cursor = self.__connection.cursor()
-        cursor.execute('CREATE TABLE "Values" ("ID" INTEGER PRIMARY KEY AUTOINCREMENT UNIQUE, "Data" TEXT NOT NULL);')
-        cursor.execute('CREATE TABLE "Keys" ("ID" INTEGER PRIMARY KEY AUTOINCREMENT UNIQUE, "Keyword" TEXT NOT NULL UNIQUE, "ExtValue" INTEGER, FOREIGN KEY("ExtValue") REFERENCES "Values"("ID"));')
+        self.__execute('CREATE TABLE "Values" ("ID" INTEGER PRIMARY KEY AUTOINCREMENT UNIQUE, "Data" TEXT NOT NULL);')
+        self.__execute('CREATE TABLE "Keys" ("ID" INTEGER PRIMARY KEY AUTOINCREMENT UNIQUE, "Keyword" TEXT NOT NULL UNIQUE, "ExtValue" INTEGER, FOREIGN KEY("ExtValue") REFERENCES "Values"("ID"));')
         self.__commit_database_changes()
 
-    def __init__(self, dbfile: str) -> None:
+    def __init__(self, dbfile: str, compress: int = 0, cachesize: int = 256) -> None:
         """
         Main constructor of FAQDatabase class.
         :param dbfile: Full path to SQLite database file.
+        :param compress: Minimum size of value in bytes to be stored
+        compressed. Zero disables compression of new values.
+        :param cachesize: Maximum number of resolved values to cache.
         """
         self.__dbfile = dbfile
+        self.__compress = compress
+        self.__cachesize = cachesize
+        self.__cache = OrderedDict()
+        self.__generation = 0
+        self.__cachelock = threading.Lock()
+        self.__callback = None
+        self.__lock = threading.RLock()
+        self.__transaction = 0
+        self.__owner = None
+        self.__changed = False
+        self.__local = threading.local()
+        self.__readers = []
+        self.__lastquery = time.monotonic()
         if os.path.isfile(self.__dbfile):
             self.__connect_to_database()
         else:
             self.__create_database_and_connect()
+        self.__create_service_tables()
 
     def __del__(self) -> None:
         """
         Main destructor of FAQDatabase class.
         """
+        for connection in self.__readers:
+            connection.close()
         self.__connection.close()
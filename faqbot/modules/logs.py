@@ -0,0 +1,149 @@
+# coding=utf-8
+
+# FAQ bot for Telegram Messenger
+# Copyright (c) 2019 - 2020 EasyCoding Team
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import threading
+
+
+class FAQQueueHandler(logging.handlers.QueueHandler):
+    @property
+    def dropped(self) -> int:
+        """
+        Get the number of log records, dropped due to full queue.
+        :return: Number of dropped records.
+        """
+        return self.__dropped
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """
+        Put a log record to the queue without blocking. If the queue is
+        full, the record will be dropped and counted. Number of dropped
+        records is taken under the lock, so it is reported only once.
+        :param record: Log record to enqueue.
+        """
+        with self.__lock:
+            pending, self.__pending = self.__pending, 0
+        try:
+            if pending:
+                self.queue.put_nowait(self.__create_drop_record(record, pending))
+                pending = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self.__lock:
+                self.__dropped += 1
+                self.__pending += pending + 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Prepare log record for enqueuing. Message is merged with its
+        arguments, but exception details are kept intact and will be
+        formatted by the background thread.
+        :param record: Log record to prepare.
+        :return: Prepared log record.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    @staticmethod
+    def __create_drop_record(record: logging.LogRecord, count: int) -> logging.LogRecord:
+        """
+        Create a synthetic log record about dropped records. Private method.
+        :param record: Log record, used as a template.
+        :param count: Number of dropped records.
+        :return: New log record.
+        """
+        return logging.makeLogRecord({'name': record.name, 'levelno': logging.WARNING, 'levelname': 'WARNING',
+                                      'msg': '%d log records were dropped due to full logging queue.',
+                                      'args': (count,)})
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        """
+        Main constructor of FAQQueueHandler class.
+        :param log_queue: Bounded queue for log records.
+        """
+        super().__init__(log_queue)
+        self.__lock = threading.Lock()
+        self.__dropped = 0
+        self.__pending = 0
+
+
+class FAQQueueListener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self) -> None:
+        """
+        Put stop marker to the queue. Unlike log records, it will wait
+        for free space in the queue and will never be dropped.
+        """
+        self.queue.put(self._sentinel)
+
+
+class FAQJsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Format log record as a single-line JSON object.
+        :param record: Log record to format.
+        :return: JSON string.
+        """
+        result = {
+            'time': self.formatTime(record, self.datefmt),
+            'level': record.levelname,
+            'name': record.name,
+            'message': record.getMessage()
+        }
+        if record.exc_info:
+            result['exception'] = self.formatException(record.exc_info)
+        return json.dumps(result, ensure_ascii=False)
+
+
+class FAQLogger:
+    @property
+    def dropped(self) -> int:
+        """
+        Get the number of log records, dropped due to full queue.
+        :return: Number of dropped records.
+        """
+        return self.__qhandler.dropped
+
+    def start(self) -> None:
+        """
+        Start background logging thread.
+        """
+        self.__listener.start()
+
+    def stop(self) -> None:
+        """
+        Flush all queued records and stop background logging thread.
+        """
+        self.__listener.stop()
+
+    def __init__(self, logger: logging.Logger, handler: logging.Handler, queue_size: int) -> None:
+        """
+        Main constructor of FAQLogger class.
+        :param logger: Logger to attach queue handler.
+        :param handler: Handler, used for writing records.
+        :param queue_size: Maximum number of queued records.
+        """
+        self.__queue = queue.Queue(queue_size)
+        self.__qhandler = FAQQueueHandler(self.__queue)
+        self.__listener = FAQQueueListener(self.__queue, handler, respect_handler_level=True)
+        logger.addHandler(self.__qhandler)
@@ -0,0 +1,119 @@
+# coding=utf-8
+
+# FAQ bot for Telegram Messenger
+# Copyright (c) 2019 - 2020 EasyCoding Team
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+import os
+import threading
+import time
+
+from typing import List
+
+from .database import FAQDatabase
+
+
+class FAQMaintenance:
+    def run(self) -> List[str]:
+        """
+        Run all required maintenance operations and log their results.
+        :return: List of executed operations.
+        """
+        operations = self.__get_operations()
+        started = time.monotonic()
+        size = self.__get_size()
+        for operation in operations:
+            self.__database.run_maintenance(operation)
+        if 'analyze' in operations:
+            self.__changes = self.__database.generation
+        self.__logger.info('Database maintenance (%s) finished in %.3f seconds, %d bytes reclaimed.',
+                           ', '.join(operations), time.monotonic() - started, size - self.__get_size())
+        return operations
+
+    def start(self) -> None:
+        """
+        Start background maintenance thread.
+        """
+        self.__worker.start()
+
+    def stop(self) -> None:
+        """
+        Stop background maintenance thread.
+        """
+        self.__stop.set()
+        if self.__worker.is_alive():
+            self.__worker.join()
+
+    def __get_operations(self) -> List[str]:
+        """
+        Get list of maintenance operations, required by thresholds.
+        Private method.
+        :return: List of operations.
+        """
+        result = []
+        if self.__database.generation - self.__changes >= self.__analyze:
+            result.append('analyze')
+        result.append('optimize')
+        if self.__database.get_journal_mode() == 'wal':
+            result.append('checkpoint')
+        _, pages, free = self.__database.get_page_stats()
+        if pages and free / pages >= self.__vacuum:
+            result.append('vacuum')
+        return result
+
+    def __get_size(self) -> int:
+        """
+        Get total size of database files on disk. Private method.
+        :return: Size in bytes.
+        """
+        return sum(os.path.getsize(fname) for fname in (self.__database.dbfile, '{}-wal'.format(
+            self.__database.dbfile)) if os.path.isfile(fname))
+
+    def __maintenance_worker(self) -> None:
+        """
+        Run maintenance with the specified interval. If the database is
+        busy serving live traffic, maintenance will be postponed until
+        it becomes idle. Private method.
+        """
+        delay = self.__interval
+        while not self.__stop.wait(delay):
+            if self.__database.idle_time < self.__idle:
+                delay = self.__idle
+                continue
+            delay = self.__interval
+            try:
+                self.run()
+            except Exception:
+                self.__logger.exception('Failed to run database maintenance.')
+
+    def __init__(self, database: FAQDatabase, interval: float, analyze: int, vacuum: float) -> None:
+        """
+        Main constructor of FAQMaintenance class.
+        :param database: Database to maintain.
+        :param interval: Interval between maintenance runs in seconds.
+        :param analyze: Number of keyword and value changes, required to run
+        ANALYZE.
+        :param vacuum: Ratio of free pages, required to run VACUUM.
+        """
+        self.__database = database
+        self.__interval = interval
+        self.__analyze = analyze
+        self.__vacuum = vacuum
+        self.__idle = 5.0
+        self.__changes = database.generation
+        self.__stop = threading.Event()
+        self.__worker = threading.Thread(target=self.__maintenance_worker, name='faqbot-maintenance', daemon=True)
+        self.__logger = logging.getLogger(__name__)
@@ -0,0 +1,207 @@
+# coding=utf-8
+
+# FAQ bot for Telegram Messenger
+# Copyright (c) 2019 - 2020 EasyCoding Team
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import threading
+
+from enum import IntEnum
+from typing import Iterable, Optional
+
+
+class FAQAutoMode(IntEnum):
+    OFF = 0
+    HASHTAGS = 1
+    KEYWORDS = 2
+
+
+class FAQMatcher:
+    def find(self, text: str, mode: FAQAutoMode) -> Optional[str]:
+        """
+        Find the first known keyword in text using a single pass of
+        the Aho-Corasick automaton. Keywords are matched as whole words
+        regardless of case. If several keywords start at the same
+        position, the longest one wins.
+        :param text: Message text.
+        :param mode: Match hashtags only or all keywords.
+        :return: Found keyword or None.
+        """
+        if mode == FAQAutoMode.OFF:
+            return None
+        goto, fail, output, maxlength = self.__get_automaton()
+        text = text.lower()
+        node = 0
+        result = None
+        for pos, char in enumerate(text):
+            if result and pos >= result[0] + maxlength:
+                break
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for length, keyword in output[node]:
+                start = pos - length + 1
+                if (not result or start < result[0] or start == result[0] and length > result[1]) and \
+                        self.__check_bounds(text, start, pos + 1, mode):
+                    result = start, length, keyword
+        return result[2] if result else None
+
+    def sync(self, keywords: Iterable[str]) -> None:
+        """
+        Bring the automaton in line with the list of keywords. Only
+        added and removed keywords will be updated, the automaton will
+        be compiled on the next search.
+        :param keywords: All keywords and aliases from the database.
+        """
+        keywords = set(keywords)
+        with self.__lock:
+            removed = self.__keywords - keywords
+            added = keywords - self.__keywords
+            if not removed and not added:
+                return
+            self.__keywords = keywords
+            if len(self.__removed) + len(removed) > len(keywords):
+                self.__build()
+                return
+            for keyword in removed:
+                self.__delete(keyword)
+            lowered = {keyword.lower() for keyword in removed}
+            for keyword in keywords:
+                if keyword in added or keyword.lower() in lowered:
+                    self.__insert(keyword)
+            self.__automaton = None
+
+    @staticmethod
+    def __check_char(char: str) -> bool:
+        """
+        Check if character can be a part of a word. Private method.
+        :param char: Character to check.
+        :return: Check results.
+        """
+        return char.isalnum() or char == '_'
+
+    def __check_bounds(self, text: str, start: int, end: int, mode: FAQAutoMode) -> bool:
+        """
+        Check if match is a whole word or a hashtag. Private method.
+        :param text: Message text.
+        :param start: Start of the match.
+        :param end: End of the match.
+        :param mode: Match hashtags only or all keywords.
+        :return: Check results.
+        """
+        if end < len(text) and self.__check_char(text[end]):
+            return False
+        before = text[start - 1] if start else ''
+        if mode == FAQAutoMode.HASHTAGS:
+            return before == '#'
+        return not before or not self.__check_char(before)
+
+    def __insert(self, keyword: str) -> None:
+        """
+        Add keyword to the trie. Private method.
+        :param keyword: Keyword to add.
+        """
+        node = 0
+        for char in keyword.lower():
+            child = self.__goto[node].get(char)
+            if child is None:
+                child = len(self.__goto)
+                self.__goto.append({})
+                self.__goto[node][char] = child
+            node = child
+        self.__terminals.setdefault(node, keyword)
+        self.__removed.discard(node)
+
+    def __delete(self, keyword: str) -> None:
+        """
+        Remove keyword from the trie. Its nodes will be left in place
+        until the next full rebuild. Private method.
+        :param keyword: Keyword to remove.
+        """
+        node = 0
+        for char in keyword.lower():
+            node = self.__goto[node].get(char)
+            if node is None:
+                return
+        if self.__terminals.get(node) == keyword:
+            del self.__terminals[node]
+            self.__removed.add(node)
+
+    def __build(self) -> None:
+        """
+        Rebuild the trie from scratch. Private method.
+        """
+        self.__goto = [{}]
+        self.__terminals = {}
+        self.__removed = set()
+        self.__automaton = None
+        for keyword in self.__keywords:
+            self.__insert(keyword)
+
+    def __compile(self) -> tuple:
+        """
+        Calculate failure links and outputs of the trie in breadth-first
+        order. Match length is the node depth, i.e. the length of the
+        lowercased keyword, which can differ from the original one.
+        Transitions are copied, so the compiled automaton can be used
+        while the trie is updated. Private method.
+        :return: Transitions, failure links and outputs of all nodes
+        together with the maximum keyword length.
+        """
+        goto = [dict(node) for node in self.__goto]
+        fail = [0] * len(goto)
+        depth = [0] * len(goto)
+        output = [()] * len(goto)
+        if 0 in self.__terminals:
+            output[0] = ((0, self.__terminals[0]),)
+        queue = list(goto[0].values())
+        for child in queue:
+            depth[child] = 1
+        for node in queue:
+            own = ((depth[node], self.__terminals[node]),) if node in self.__terminals else ()
+            output[node] = own + output[fail[node]]
+            for char, child in goto[node].items():
+                state = fail[node]
+                while state and char not in goto[state]:
+                    state = fail[state]
+                fail[child] = goto[state].get(char, 0) if node else 0
+                depth[child] = depth[node] + 1
+                queue.append(child)
+        return goto, fail, output, max((depth[node] for node in self.__terminals), default=0)
+
+    def __get_automaton(self) -> tuple:
+        """
+        Get compiled automaton, compiling it if the trie has been
+        changed. Private method.
+        :return: Transitions, failure links, outputs and maximum keyword
+        length.
+        """
+        automaton = self.__automaton
+        if automaton is None:
+            with self.__lock:
+                if self.__automaton is None:
+                    self.__automaton = self.__compile()
+                automaton = self.__automaton
+        return automaton
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        """
+        Main constructor of FAQMatcher class.
+        :param keywords: All keywords and aliases from the database.
+        """
+        self.__lock = threading.Lock()
+        self.__keywords = set(keywords)
+        self.__build()
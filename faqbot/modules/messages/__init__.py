@@ -16,6 +16,8 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from typing import Tuple
+
 from .factory import FAQMessagesFactory
 from .locales.en import FAQMessagesEn
 from .locales.ru import FAQMessagesRu
@@ -34,9 +36,8 @@ class FAQMessages:
         """
         self.__factory.add_language('en', FAQMessagesEn)
         self.__factory.add_language('ru', FAQMessagesRu)
-        self.__factory.add_language('uk', FAQMessagesRu)
-        self.__factory.add_language('be', FAQMessagesRu)
-        self.__factory.add_language('kk', FAQMessagesRu)
+        for lang in self.__fallbacks:
+            self.__factory.add_language(lang, FAQMessagesRu)
 
     def get_message(self, key: str, lang: str = 'en') -> str:
         """
@@ -47,9 +48,27 @@ class FAQMessages:
         """
         return self.__factory.get_language(lang).get_message(key)
 
+    def get_fallback(self, lang: str) -> Tuple[str, ...]:
+        """
+        Get chain of languages to try for the specified language, from
+        the most to the least specific one (e.g. uk, ru). Default value
+        should be used when none of them is available.
+        :param lang: Required language (IETF tag, as sent by Telegram).
+        :return: Tuple with language codes.
+        """
+        if not lang:
+            return ()
+        lang = lang.lower()
+        base = lang.split('-', 1)[0]
+        chain = [lang, base]
+        if base in self.__fallbacks:
+            chain.append(self.__fallbacks[base])
+        return tuple(dict.fromkeys(chain))
+
     def __init__(self) -> None:
         """
         Main constructor of the FAQMessages class.
         """
+        self.__fallbacks = {'uk': 'ru', 'be': 'ru', 'kk': 'ru'}
         self.__init_factory()
         self.__add_languages()
@@ -44,5 +44,29 @@ class FAQMessagesEn(FAQCommonLocale):
         'fb_listkw': 'Available keywords: {}.',
         'fb_addexists': 'The *{}* keyword is already exists in our database. No actions will be performed.',
         'fb_notexists': 'The *{}* keyword does not exists in our database. No actions will be performed.',
-        'fb_faqlink': 'You will find the answers for the most of questions in our unofficial FAQ: {}'
+        'fb_faqlink': 'You will find the answers for the most of questions in our unofficial FAQ: {}',
+        'fb_profon': 'Profiling is enabled. Results will be saved to the data directory.',
+        'fb_profoff': 'Profiling is disabled.',
+        'fb_profsnap': 'Memory snapshot was saved. Differences: `{}`.',
+        'fb_profnotrun': 'Profiling is not enabled. Use `/profile on` first.',
+        'fb_stats': 'Statistics for the last {} hours.\nTop hits: {}.\nTop misses: {}.',
+        'fb_batchok': 'All {} operations were applied:',
+        'fb_batchfail': 'Some of {} operations failed. No changes were made:',
+        'fb_flood': 'Too many requests. Please wait a bit and try again.',
+        'fb_backuplog': 'Admin {} ({}) has created database backup {}.',
+        'fb_backupmsg': 'Database backup was saved to `{}`.',
+        'fb_autoon': 'Automatic answers are enabled in this chat for all known keywords.',
+        'fb_autotags': 'Automatic answers are enabled in this chat for #hashtags only.',
+        'fb_autooff': 'Automatic answers are disabled in this chat.',
+        'fb_autodenied': 'Only chat administrators can change automatic answers mode.',
+        'fb_autolog': 'User {} ({}) has changed automatic answers mode of chat {} to {}.',
+        'fb_syncoff': 'Synchronization directory is not configured.',
+        'fb_syncerr': 'Synchronization failed, no changes were made: {}',
+        'fb_syncmsg': 'Synchronization completed in {:.0f} ms: {} added, {} updated, {} removed, {} unchanged.',
+        'fb_synclog': 'Admin {} ({}) has synchronized the database: {} added, {} updated, {} removed, {} unchanged.',
+        'fb_langsetmsg': 'The *{}* description of the keyword *{}* was saved to the database.',
+        'fb_langsetlog': 'Admin {} ({}) has set {} description of the keyword {} in the database.',
+        'fb_langremmsg': 'The *{}* description of the keyword *{}* was removed from the database.',
+        'fb_langremlog': 'Admin {} ({}) has removed {} description of the keyword {} from the database.',
+        'fb_langnotexists': 'The *{}* description of the keyword *{}* does not exist in the database.'
     }
@@ -44,5 +44,29 @@ class FAQMessagesRu(FAQCommonLocale):
         'fb_listkw': 'Имеющиеся ключевые слова: {}.',
         'fb_addexists': 'Ключевое слово *{}* уже существует в базе данных. Никаких действий не было произведено.',
         'fb_notexists': 'Ключевое слово *{}* не существует в базе данных. Никаких действий не было произведено.',
-        'fb_faqlink': 'Ответы на самые популярные вопросы вы всегда найдёте в нашем FAQ: {}'
+        'fb_faqlink': 'Ответы на самые популярные вопросы вы всегда найдёте в нашем FAQ: {}',
+        'fb_profon': 'Профилирование включено. Результаты будут сохранены в каталог с данными.',
+        'fb_profoff': 'Профилирование отключено.',
+        'fb_profsnap': 'Снимок памяти был успешно сохранён. Различия: `{}`.',
+        'fb_profnotrun': 'Профилирование не включено. Сначала выполните `/profile on`.',
+        'fb_stats': 'Статистика за последние {} ч.\nЧаще всего находили: {}.\nЧаще всего не находили: {}.',
+        'fb_batchok': 'Все операции ({}) были успешно выполнены:',
+        'fb_batchfail': 'Некоторые из операций ({}) завершились ошибкой. Никаких изменений не было произведено:',
+        'fb_flood': 'Слишком много запросов. Пожалуйста, подождите немного и повторите попытку.',
+        'fb_backuplog': 'Администратор {} ({}) создал резервную копию базы данных {}.',
+        'fb_backupmsg': 'Резервная копия базы данных была сохранена в `{}`.',
+        'fb_autoon': 'Автоматические ответы включены в этом чате для всех известных ключевых слов.',
+        'fb_autotags': 'Автоматические ответы включены в этом чате только для #хештегов.',
+        'fb_autooff': 'Автоматические ответы отключены в этом чате.',
+        'fb_autodenied': 'Изменять режим автоматических ответов могут только администраторы чата.',
+        'fb_autolog': 'Пользователь {} ({}) изменил режим автоматических ответов чата {} на {}.',
+        'fb_syncoff': 'Каталог для синхронизации не настроен.',
+        'fb_syncerr': 'Синхронизация не удалась, изменения не были внесены: {}',
+        'fb_syncmsg': 'Синхронизация завершена за {:.0f} мс: добавлено {}, обновлено {}, удалено {}, без изменений {}.',
+        'fb_synclog': 'Администратор {} ({}) синхронизировал базу данных: добавлено {}, обновлено {}, удалено {}, без изменений {}.',
+        'fb_langsetmsg': 'Описание *{}* для ключевого слова *{}* было сохранено в базе данных.',
+        'fb_langsetlog': 'Администратор {} ({}) задал описание {} для ключевого слова {} в базе данных.',
+        'fb_langremmsg': 'Описание *{}* для ключевого слова *{}* было удалено из базы данных.',
+        'fb_langremlog': 'Администратор {} ({}) удалил описание {} для ключевого слова {} из базы данных.',
+        'fb_langnotexists': 'Описание *{}* для ключевого слова *{}* отсутствует в базе данных.'
     }
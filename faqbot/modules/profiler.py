@@ -0,0 +1,170 @@
+# coding=utf-8
+
+# FAQ bot for Telegram Messenger
+# Copyright (c) 2019 - 2020 EasyCoding Team
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import cProfile
+import functools
+import itertools
+import logging
+import os
+import threading
+import time
+import tracemalloc
+
+from typing import Any, Callable
+
+
+class FAQProfiler:
+    @property
+    def enabled(self) -> bool:
+        """
+        Get current profiler state.
+        :return: True if profiling is enabled.
+        """
+        return self.__enabled
+
+    def profile(self, handler: Callable) -> Callable:
+        """
+        Decorator for sampled profiling of bot handlers. Every N-th call of
+        the handler will be profiled and saved in pstats format.
+        :param handler: Handler to profile.
+        :return: Wrapped handler.
+        """
+        counter = [0]
+
+        @functools.wraps(handler)
+        def wrapper(*args, **kwargs) -> Any:
+            if not self.__enabled:
+                return handler(*args, **kwargs)
+            counter[0] += 1
+            if counter[0] % self.__rate or not self.__plock.acquire(blocking=False):
+                return handler(*args, **kwargs)
+            try:
+                profiler = cProfile.Profile()
+                try:
+                    return profiler.runcall(handler, *args, **kwargs)
+                finally:
+                    profiler.dump_stats('{}.prof'.format(self.__get_file_name(handler.__name__)))
+            finally:
+                self.__plock.release()
+
+        return wrapper
+
+    def log_query(self, query: str, params: tuple, elapsed: float) -> None:
+        """
+        Write SQL query to slow query log if its execution time exceeds
+        the specified threshold.
+        :param query: SQL query.
+        :param params: Query parameters.
+        :param elapsed: Execution time in seconds.
+        """
+        if self.__enabled and elapsed * 1000 >= self.__slowquery:
+            with self.__qlock:
+                with open(os.path.join(self.__path, 'slowquery.log'), 'a') as f:
+                    f.write('{} {:.3f} ms {} {}\n'.format(time.strftime('%Y-%m-%dT%H:%M:%S'), elapsed * 1000,
+                                                          query, params))
+
+    def take_snapshot(self) -> str:
+        """
+        Take memory allocations snapshot and compare it with the previous
+        one. Both snapshot and the differences will be saved to disk.
+        :return: Name of the file with differences.
+        """
+        with self.__slock:
+            snapshot = tracemalloc.take_snapshot()
+            fname = self.__get_file_name('memory')
+            snapshot.dump('{}.snap'.format(fname))
+            result = '{}.txt'.format(fname)
+            with open(result, 'w') as f:
+                if self.__snapshot:
+                    stats = snapshot.compare_to(self.__snapshot, 'lineno')
+                else:
+                    stats = snapshot.statistics('lineno')
+                for stat in stats[:self.__topstats]:
+                    f.write('{}\n'.format(stat))
+            self.__snapshot = snapshot
+            return result
+
+    def start(self) -> None:
+        """
+        Enable profiling and start periodic memory snapshots.
+        """
+        if self.__enabled:
+            return
+        os.makedirs(self.__path, exist_ok=True)
+        tracemalloc.start()
+        self.__enabled = True
+        self.__stop.clear()
+        self.__worker = threading.Thread(target=self.__snapshot_worker, name='faqbot-profiler', daemon=True)
+        self.__worker.start()
+        self.__logger.warning('Profiling enabled. Results will be saved to %s.', self.__path)
+
+    def stop(self) -> None:
+        """
+        Disable profiling and stop periodic memory snapshots.
+        """
+        if not self.__enabled:
+            return
+        self.__enabled = False
+        self.__stop.set()
+        self.__worker.join()
+        self.__snapshot = None
+        tracemalloc.stop()
+        self.__logger.warning('Profiling disabled.')
+
+    def __snapshot_worker(self) -> None:
+        """
+        Take memory snapshots with the specified interval. Private method.
+        """
+        while not self.__stop.wait(self.__interval):
+            try:
+                self.take_snapshot()
+            except Exception:
+                self.__logger.exception('Failed to take memory snapshot.')
+
+    def __get_file_name(self, prefix: str) -> str:
+        """
+        Generate unique file name without extension for profiling
+        results. Private method.
+        :param prefix: File name prefix.
+        :return: Full file name.
+        """
+        return os.path.join(self.__path, '{}-{}-{}'.format(prefix, time.strftime('%Y%m%d%H%M%S'),
+                                                           next(self.__sequence)))
+
+    def __init__(self, path: str, rate: int, slowquery: float, interval: float) -> None:
+        """
+        Main constructor of FAQProfiler class.
+        :param path: Directory for profiling results.
+        :param rate: Profile every N-th call of each handler.
+        :param slowquery: Slow query threshold in milliseconds.
+        :param interval: Interval between memory snapshots in seconds.
+        """
+        self.__path = path
+        self.__rate = max(rate, 1)
+        self.__slowquery = slowquery
+        self.__interval = interval
+        self.__topstats = 25
+        self.__enabled = False
+        self.__snapshot = None
+        self.__worker = None
+        self.__sequence = itertools.count()
+        self.__plock = threading.Lock()
+        self.__qlock = threading.Lock()
+        self.__slock = threading.Lock()
+        self.__stop = threading.Event()
+        self.__logger = logging.getLogger(__name__)
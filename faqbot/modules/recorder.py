@@ -0,0 +1,136 @@
+# coding=utf-8
+
+# FAQ bot for Telegram Messenger
+# Copyright (c) 2019 - 2020 EasyCoding Team
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+
+from typing import Callable, Iterator, List, Optional
+
+
+class FAQRecorder:
+    @property
+    def filename(self) -> str:
+        """
+        Get full path to the current capture file.
+        :return: Full path to capture file.
+        """
+        return self.__filename
+
+    def record(self, updates: list) -> None:
+        """
+        Append incoming text messages to the capture file together with
+        their arrival times. User and chat IDs are replaced by salted
+        hashes, ordinary messages are replaced by filler of the same
+        length, keeping only the first known keyword. Commands are kept
+        as is.
+        :param updates: Updates, received from Telegram.
+        """
+        now = time.monotonic()
+        lines = []
+        for update in updates:
+            message = update.message
+            if not message or message.content_type != 'text' or not message.text:
+                continue
+            entry = {'t': round(now - self.__started, 3), 'u': self.__anonymize(message.from_user.id),
+                     'c': self.__anonymize(message.chat.id), 'ct': message.chat.type,
+                     'l': message.from_user.language_code or '', 'x': self.__anonymize_text(message.text)}
+            if message.from_user.id in self.__admins:
+                entry['a'] = 1
+            if message.reply_to_message:
+                entry['r'] = 1
+            lines.append(json.dumps(entry, ensure_ascii=False, separators=(',', ':')))
+        if not lines:
+            return
+        with self.__lock:
+            self.__file.write('\n'.join(lines) + '\n')
+            if now - self.__flushed > 1.0:
+                self.__file.flush()
+                self.__flushed = now
+
+    def close(self) -> None:
+        """
+        Flush and close the capture file.
+        """
+        with self.__lock:
+            self.__file.close()
+
+    @staticmethod
+    def read(filename: str) -> Iterator[dict]:
+        """
+        Read entries from the capture file. Incomplete last line, left
+        after crash, is ignored.
+        :param filename: Full path to capture file.
+        :return: Captured messages.
+        """
+        with open(filename, 'r', encoding='utf-8') as file:
+            for line in file:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    def __anonymize(self, value: int) -> int:
+        """
+        Replace user or chat ID by salted hash, keeping its sign. The
+        same ID always gets the same hash within a single capture, but
+        captures cannot be linked with each other. Private method.
+        :param value: User or chat ID.
+        :return: Anonymized ID.
+        """
+        digest = hmac.new(self.__salt, str(abs(value)).encode('ascii'), hashlib.sha256).digest()
+        result = int.from_bytes(digest[:6], 'big') or 1
+        return -result if value < 0 else result
+
+    def __anonymize_text(self, text: str) -> str:
+        """
+        Replace ordinary message by filler of the same length. The first
+        known keyword is kept, so automatic answers can be replayed.
+        Private method.
+        :param text: Message text.
+        :return: Anonymized text.
+        """
+        if text.startswith('/'):
+            return text
+        keyword = self.__find(text)
+        if not keyword:
+            return 'x' * len(text)
+        if '#{}'.format(keyword.lower()) in text.lower():
+            keyword = '#{}'.format(keyword)
+        return '{} {}'.format('x' * max(len(text) - len(keyword) - 1, 0), keyword).lstrip()
+
+    def __init__(self, path: str, admins: List[int], find: Callable[[str], Optional[str]]) -> None:
+        """
+        Main constructor of FAQRecorder class. Each instance writes to
+        a new capture file.
+        :param path: Full path to directory for capture files.
+        :param admins: IDs of bot admins, whose messages will be marked.
+        :param find: Function, which returns the first known keyword in text.
+        """
+        os.makedirs(path, exist_ok=True)
+        self.__filename = os.path.join(path, 'capture-{}.rec'.format(time.strftime('%Y%m%d-%H%M%S')))
+        self.__admins = set(admins)
+        self.__find = find
+        self.__salt = os.urandom(16)
+        self.__lock = threading.Lock()
+        self.__started = self.__flushed = time.monotonic()
+        self.__file = open(self.__filename, 'a', encoding='utf-8')
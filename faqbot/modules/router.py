@@ -0,0 +1,156 @@
+# coding=utf-8
+
+# FAQ bot for Telegram Messenger
+# Copyright (c) 2019 - 2020 EasyCoding Team
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import re
+
+from enum import Enum
+from typing import Callable, Dict, NamedTuple, Optional
+
+
+class FAQArguments(Enum):
+    NONE = 0
+    OPTIONAL = 1
+    REQUIRED = 2
+    PAIR = 3
+
+
+class FAQLimit(Enum):
+    ALLOW = 0
+    DROP = 1
+    NOTIFY = 2
+
+
+class FAQCommand(NamedTuple):
+    handler: Callable
+    arguments: FAQArguments
+    check: Optional[Callable]
+    onerror: Callable
+    batch: Optional[Callable]
+    limit: Optional[Callable]
+
+
+class FAQRouter:
+    def add_command(self, name: str, handler: Callable, arguments: FAQArguments, check: Optional[Callable] = None,
+                    onerror: Optional[Callable] = None, batch: Optional[Callable] = None,
+                    limit: Optional[Callable] = None) -> None:
+        """
+        Add command to the routing table.
+        :param name: Command name without leading slash.
+        :param handler: Handler, which will receive the message and parsed arguments.
+        :param arguments: Expected command arguments.
+        :param check: Permission check. If not set, command is public.
+        :param onerror: Error handler. If not set, default one will be used.
+        :param batch: Handler for multi-line payloads and attached documents,
+        which will receive the message and the payload. If not set, such
+        payloads are not supported.
+        :param limit: Rate limiter, which will receive the message and return
+        FAQLimit value. It will be called before any other work.
+        """
+        self.__commands[name] = FAQCommand(handler, arguments, check, onerror or self.__onerror, batch, limit)
+
+    def check(self, message) -> bool:
+        """
+        Parse message and check if it contains a known command, allowed
+        for its sender. Parsed command will be stored in the message.
+        Command, followed by a line break, or attached to a document as a
+        caption, starts a batch if supported.
+        :param message: Message to check.
+        :return: Check results.
+        """
+        document = message.content_type == 'document'
+        text = message.caption if document else message.text
+        if not text or text[0] != '/':
+            return False
+        query = text.strip()
+        match = self.__separator.search(query)
+        name = query[1:match.start()] if match else query[1:]
+        command = self.__commands.get(name.split('@', 1)[0])
+        if not command or (document and not command.batch) or (command.check and not command.check(message)):
+            return False
+        limit = command.limit(message) if command.limit else FAQLimit.ALLOW
+        if limit == FAQLimit.DROP:
+            return False
+        batch = command.batch is not None and (document or (match is not None and match.group() == '\n'))
+        message.faq_command = command, query[match.end():] if match else '', batch, limit
+        return True
+
+    def dispatch(self, message) -> None:
+        """
+        Run handler of the command, previously parsed by check method.
+        :param message: Message, triggered this event.
+        """
+        command, param, batch, limit = message.faq_command
+        if limit == FAQLimit.NOTIFY:
+            self.__onlimit(message)
+            return
+        if batch:
+            try:
+                command.batch(message, param)
+            except Exception:
+                command.onerror(message)
+            return
+        try:
+            args = self.__parse_arguments(command.arguments, param)
+        except ValueError:
+            self.__onsyntax(message)
+            return
+        try:
+            command.handler(message, *args)
+        except Exception:
+            command.onerror(message)
+
+    def parse_arguments(self, arguments: FAQArguments, param: str) -> tuple:
+        """
+        Get command arguments from the source string.
+        :param arguments: Expected command arguments.
+        :param param: Source string.
+        :return: Tuple with arguments.
+        """
+        return self.__parse_arguments(arguments, param)
+
+    @staticmethod
+    def __parse_arguments(arguments: FAQArguments, param: str) -> tuple:
+        """
+        Get command arguments from the source string. Private method.
+        :param arguments: Expected command arguments.
+        :param param: Source string.
+        :return: Tuple with arguments.
+        """
+        if arguments == FAQArguments.NONE:
+            return ()
+        if arguments == FAQArguments.OPTIONAL:
+            return param,
+        if not param:
+            raise ValueError('Cannot find parameters to extract.')
+        if arguments == FAQArguments.REQUIRED:
+            return param,
+        index = param.index(' ')
+        return param[:index], param[index + 1:]
+
+    def __init__(self, onsyntax: Callable, onerror: Callable, onlimit: Optional[Callable] = None) -> None:
+        """
+        Main constructor of FAQRouter class.
+        :param onsyntax: Handler for commands with missing or malformed arguments.
+        :param onerror: Default handler for commands, raised an exception.
+        :param onlimit: Handler for commands, rejected by rate limiter with notice.
+        """
+        self.__commands: Dict[str, FAQCommand] = {}
+        self.__separator = re.compile(r'\s')
+        self.__onsyntax = onsyntax
+        self.__onerror = onerror
+        self.__onlimit = onlimit
@@ -0,0 +1,99 @@
+# coding=utf-8
+
+# FAQ bot for Telegram Messenger
+# Copyright (c) 2019 - 2020 EasyCoding Team
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import contextlib
+import signal
+import threading
+
+from typing import Iterator
+
+
+class FAQShutdown(BaseException):
+    """
+    Raised by termination signal handler to interrupt fetching of updates.
+    """
+
+
+class FAQSignals:
+    @property
+    def stopping(self) -> threading.Event:
+        """
+        Get event, which will be set when termination signal is received.
+        :return: Termination event.
+        """
+        return self.__stopping
+
+    def check_reload(self) -> bool:
+        """
+        Check if reload signal was received since the previous call.
+        :return: True if reload is requested.
+        """
+        if not self.__reloading.is_set():
+            return False
+        self.__reloading.clear()
+        return True
+
+    @contextlib.contextmanager
+    def interruptible(self) -> Iterator[None]:
+        """
+        Allow termination signal to interrupt the code inside this context
+        by raising FAQShutdown exception. Must be used in the main thread
+        only for operations, which can be safely aborted.
+        """
+        if self.__stopping.is_set():
+            raise FAQShutdown()
+        self.__interruptible = True
+        try:
+            yield
+        finally:
+            self.__interruptible = False
+
+    def install(self) -> None:
+        """
+        Install signal handlers. Must be called from the main thread.
+        """
+        signal.signal(signal.SIGTERM, self.__handle_stop)
+        signal.signal(signal.SIGINT, self.__handle_stop)
+        if hasattr(signal, 'SIGHUP'):
+            signal.signal(signal.SIGHUP, self.__handle_reload)
+
+    def __handle_stop(self, signum: int, frame) -> None:
+        """
+        Handle SIGTERM and SIGINT signals. Private method.
+        :param signum: Signal number.
+        :param frame: Current stack frame.
+        """
+        self.__stopping.set()
+        if self.__interruptible:
+            raise FAQShutdown()
+
+    def __handle_reload(self, signum: int, frame) -> None:
+        """
+        Handle SIGHUP signal. Private method.
+        :param signum: Signal number.
+        :param frame: Current stack frame.
+        """
+        self.__reloading.set()
+
+    def __init__(self) -> None:
+        """
+        Main constructor of FAQSignals class.
+        """
+        self.__stopping = threading.Event()
+        self.__reloading = threading.Event()
+        self.__interruptible = False
@@ -0,0 +1,342 @@
+# coding=utf-8
+
+# FAQ bot for Telegram Messenger
+# Copyright (c) 2019 - 2020 EasyCoding Team
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import contextlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from .database import FAQDatabase
+from .storage import FAQCommonStorage
+
+
+class FAQSnapshot(FAQCommonStorage):
+    __magic = b'FAQS'
+    __version = 3
+    __header = struct.Struct('<4sIIQ')
+    __entry = struct.Struct('<IIII')
+
+    def get_value(self, keyword: str, langs: Sequence[str] = ()) -> Optional[str]:
+        """
+        Get value from snapshot by the specified keyword. Language variants
+        are stored as separate index entries with language code appended
+        to keyword after zero byte.
+        :param keyword: Keyword to search.
+        :param langs: Preferred languages.
+        :return: Value from snapshot or None if not found.
+        """
+        mm, count = self.__get_map()
+        key = keyword.encode('utf-8')
+        for lang in langs:
+            index = self.__find(mm, count, b'%s\0%s' % (key, lang.encode('utf-8')))
+            if index >= 0:
+                return self.__get_value(mm, index)
+        index = self.__find(mm, count, key)
+        return self.__get_value(mm, index) if index >= 0 else None
+
+    def check_exists(self, keyword: str) -> bool:
+        """
+        Check if the specified keyword exists in snapshot. Inside
+        transaction the database will be checked instead, because the
+        snapshot is not rebuilt until its end.
+        :param keyword: Keyword to check.
+        :return: Return True if exists.
+        """
+        if self.__batch and self.__owner == threading.get_ident():
+            return self.__database.check_exists(keyword)
+        mm, count = self.__get_map()
+        return self.__find(mm, count, keyword.encode('utf-8')) >= 0
+
+    def list_keywords(self) -> list:
+        """
+        List all available keywords from snapshot.
+        """
+        mm, count = self.__get_map()
+        keywords = (self.__get_key(mm, index) for index in range(count))
+        return [keyword.decode('utf-8') for keyword in keywords if b'\0' not in keyword]
+
+    def list_values(self) -> List[Tuple[str, int, str]]:
+        """
+        List all available keywords with internal IDs and values.
+        :return: List of tuples with keyword, internal ID and value.
+        """
+        return self.__database.list_values()
+
+    def add_value(self, keyword: str, value: str) -> None:
+        """
+        Set value for the specified keyword. Snapshot will be rebuilt.
+        :param keyword: Keyword to operate with.
+        :param value: New value.
+        """
+        self.__database.add_value(keyword, value)
+        self.__update()
+
+    def set_value(self, keyword: str, new_value: str) -> None:
+        """
+        Set value for the specified keyword. Snapshot will be rebuilt.
+        :param keyword: Keyword to operate with.
+        :param new_value: New value.
+        """
+        self.__database.set_value(keyword, new_value)
+        self.__update()
+
+    def remove_value(self, keyword: str) -> None:
+        """
+        Remove keyword from the database. Snapshot will be rebuilt.
+        :param keyword: Keyword to operate with.
+        """
+        self.__database.remove_value(keyword)
+        self.__update()
+
+    def add_alias(self, keyword: str, new_alias: str) -> None:
+        """
+        Add a new alias for the specified keyword. Snapshot will be rebuilt.
+        :param keyword: Keyword to operate with.
+        :param new_alias: New alias.
+        """
+        self.__database.add_alias(keyword, new_alias)
+        self.__update()
+
+    def remove_alias(self, alias: str) -> None:
+        """
+        Remove alias from the database. Snapshot will be rebuilt.
+        :param alias: Alias to operate with.
+        """
+        self.__database.remove_alias(alias)
+        self.__update()
+
+    def set_variant(self, keyword: str, lang: str, value: str) -> None:
+        """
+        Add or change language variant of the specified keyword's value.
+        Snapshot will be rebuilt.
+        :param keyword: Keyword to operate with.
+        :param lang: Language code.
+        :param value: Localized value.
+        """
+        self.__database.set_variant(keyword, lang, value)
+        self.__update()
+
+    def remove_variant(self, keyword: str, lang: str) -> bool:
+        """
+        Remove language variant of the specified keyword's value. Snapshot
+        will be rebuilt.
+        :param keyword: Keyword to operate with.
+        :param lang: Language code.
+        :return: Return True if variant was removed.
+        """
+        result = self.__database.remove_variant(keyword, lang)
+        self.__update()
+        return result
+
+    def list_variants(self) -> List[Tuple[int, str, str]]:
+        """
+        List all language variants with internal IDs of their values.
+        :return: List of tuples with internal ID, language and value.
+        """
+        return self.__database.list_variants()
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Run all changes, made inside this context, in a single database
+        transaction. Snapshot will be rebuilt only once on its successful
+        exit. Readers are not blocked and will use the previous snapshot
+        until the new one is ready.
+        """
+        with self.__writelock:
+            self.__batch += 1
+            self.__owner = threading.get_ident()
+            try:
+                with self.__database.transaction():
+                    yield
+            finally:
+                self.__batch -= 1
+            self.__update()
+
+    def reload(self) -> None:
+        """
+        Map the current snapshot file into memory again.
+        """
+        with self.__lock:
+            self.__load_snapshot()
+
+    def rebuild(self) -> None:
+        """
+        Write a new snapshot from the database contents and atomically
+        replace the old one. Lock, used by readers, is taken only to swap
+        the mapping.
+        """
+        with self.__writelock:
+            generation = self.__database.generation
+            self.__write_snapshot(generation, self.__database.list_values(), self.__database.list_variants())
+            with self.__lock:
+                self.__load_snapshot()
+
+    def __update(self) -> None:
+        """
+        Rebuild snapshot after changes unless transaction is running.
+        Private method.
+        """
+        if not self.__batch:
+            self.rebuild()
+
+    def __write_snapshot(self, generation: int, rows: List[Tuple[str, int, str]],
+                         variants: List[Tuple[int, str, str]]) -> None:
+        """
+        Write snapshot file to disk. Snapshot consists of the header
+        (magic, version, number of entries and content generation of the
+        database), the index, sorted by UTF-8
+        encoded keywords (offsets and lengths of keyword and its value),
+        and the blob with keywords and values. Language variants are added
+        as entries with keyword and language, separated by zero byte.
+        Values, shared by aliases, are stored only once. Private method.
+        :param generation: Content generation of the database.
+        :param rows: List of tuples with keyword, internal ID and value.
+        :param variants: List of tuples with internal ID, language and value.
+        """
+        langs = {}
+        for kwid, lang, value in variants:
+            langs.setdefault(kwid, []).append((lang, value))
+        entries = []
+        for keyword, kwid, value in rows:
+            key = keyword.encode('utf-8')
+            entries.append((key, (kwid, ''), value))
+            for lang, variant in langs.get(kwid, ()):
+                entries.append((b'%s\0%s' % (key, lang.encode('utf-8')), (kwid, lang), variant))
+        entries.sort()
+        offset = self.__header.size + len(entries) * self.__entry.size
+        index, blob, values = [], [], {}
+        for keyword, valueid, value in entries:
+            koff = offset
+            blob.append(keyword)
+            offset += len(keyword)
+            if valueid not in values:
+                data = value.encode('utf-8')
+                values[valueid] = offset, len(data)
+                blob.append(data)
+                offset += len(data)
+            index.append(self.__entry.pack(koff, len(keyword), *values[valueid]))
+        fd, tmpfile = tempfile.mkstemp(suffix='.tmp', prefix='{}.'.format(os.path.basename(self.__snapfile)),
+                                       dir=os.path.dirname(self.__snapfile))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self.__header.pack(self.__magic, self.__version, len(entries), generation))
+                f.write(b''.join(index))
+                f.write(b''.join(blob))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmpfile, self.__snapfile)
+        except Exception:
+            os.remove(tmpfile)
+            raise
+
+    def __load_snapshot(self) -> None:
+        """
+        Map snapshot file into memory. Previous mapping will be released
+        when no readers use it anymore. Private method.
+        """
+        with open(self.__snapfile, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, generation = self.__header.unpack_from(mm)
+        if magic != self.__magic or version != self.__version:
+            mm.close()
+            raise ValueError('Snapshot file {} has unsupported format.'.format(self.__snapfile))
+        self.__map = mm, count
+        self.__generation = generation
+        self.__stamp = stat.st_ino, stat.st_mtime_ns
+        self.__checked = time.monotonic()
+
+    def __get_map(self) -> tuple:
+        """
+        Get current snapshot mapping. Snapshot file will be checked for
+        changes, made by other processes, not often than once per
+        interval. Private method.
+        :return: Tuple with mapping and number of keywords.
+        """
+        if time.monotonic() - self.__checked > self.__interval:
+            with self.__lock:
+                self.__checked = time.monotonic()
+                stat = os.stat(self.__snapfile)
+                if (stat.st_ino, stat.st_mtime_ns) != self.__stamp:
+                    self.__load_snapshot()
+        return self.__map
+
+    def __get_value(self, mm: mmap.mmap, index: int) -> str:
+        """
+        Get value by its position in the index. Private method.
+        :param mm: Snapshot mapping.
+        :param index: Position in the index.
+        :return: Value.
+        """
+        _, _, voff, vlen = self.__entry.unpack_from(mm, self.__header.size + index * self.__entry.size)
+        return mm[voff:voff + vlen].decode('utf-8')
+
+    def __get_key(self, mm: mmap.mmap, index: int) -> bytes:
+        """
+        Get keyword by its position in the index. Private method.
+        :param mm: Snapshot mapping.
+        :param index: Position in the index.
+        :return: UTF-8 encoded keyword.
+        """
+        koff, klen, _, _ = self.__entry.unpack_from(mm, self.__header.size + index * self.__entry.size)
+        return mm[koff:koff + klen]
+
+    def __find(self, mm: mmap.mmap, count: int, keyword: bytes) -> int:
+        """
+        Find keyword in the sorted index using binary search. Private
+        method.
+        :param mm: Snapshot mapping.
+        :param count: Number of keywords.
+        :param keyword: UTF-8 encoded keyword.
+        :return: Position in the index or -1 if not found.
+        """
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            if self.__get_key(mm, middle) < keyword:
+                low = middle + 1
+            else:
+                high = middle
+        return low if low < count and self.__get_key(mm, low) == keyword else -1
+
+    def __init__(self, database: FAQDatabase, snapfile: str) -> None:
+        """
+        Main constructor of FAQSnapshot class.
+        :param database: Database for storing changes.
+        :param snapfile: Full path to snapshot file.
+        """
+        self.__database = database
+        self.__snapfile = snapfile
+        self.__interval = 1.0
+        self.__lock = threading.RLock()
+        self.__writelock = threading.RLock()
+        self.__batch = 0
+        self.__owner = None
+        try:
+            self.__load_snapshot()
+            if self.__generation == database.generation:
+                return
+        except (OSError, ValueError, struct.error):
+            pass
+        self.rebuild()
@@ -0,0 +1,114 @@
+# coding=utf-8
+
+# FAQ bot for Telegram Messenger
+# Copyright (c) 2019 - 2020 EasyCoding Team
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+import threading
+import time
+
+from typing import Dict, List, Tuple
+
+from .database import FAQDatabase
+
+
+class FAQStatistics:
+    def count(self, keyword: str, found: bool) -> None:
+        """
+        Count keyword lookup in memory. Counters will be written to the
+        database by the background thread.
+        :param keyword: Requested keyword.
+        :param found: Lookup result.
+        """
+        key = keyword[:self.__maxlength], found
+        with self.__lock:
+            self.__counters[key] = self.__counters.get(key, 0) + 1
+
+    def flush(self) -> None:
+        """
+        Write all collected counters to the database in a single
+        transaction. Counters, older than retention period, are removed
+        once per period.
+        """
+        with self.__lock:
+            counters, self.__counters = self.__counters, {}
+        period = int(time.time()) // self.__period * self.__period
+        if counters:
+            self.__database.add_statistics([(keyword, found, period, total)
+                                            for (keyword, found), total in counters.items()])
+        if self.__retention and period != self.__pruned:
+            self.__pruned = period
+            removed = self.__database.remove_statistics(period - self.__retention * 86400)
+            if removed:
+                self.__logger.info('Removed %d outdated statistics records.', removed)
+
+    def get_top(self, found: bool, hours: int) -> List[Tuple[str, int]]:
+        """
+        Get the most requested keywords for the specified time window.
+        :param found: Get successful (True) or failed (False) lookups.
+        :param hours: Time window in hours.
+        :return: List of tuples with keyword and number of lookups.
+        """
+        self.flush()
+        return self.__database.get_statistics(found, int(time.time()) - hours * 3600, self.__limit)
+
+    def start(self) -> None:
+        """
+        Start background thread, periodically writing counters to the
+        database.
+        """
+        self.__worker.start()
+
+    def stop(self) -> None:
+        """
+        Stop background thread and write remaining counters to the
+        database.
+        """
+        self.__stop.set()
+        if self.__worker.is_alive():
+            self.__worker.join()
+        self.flush()
+
+    def __flush_worker(self) -> None:
+        """
+        Write counters to the database with the specified interval.
+        Private method.
+        """
+        while not self.__stop.wait(self.__interval):
+            try:
+                self.flush()
+            except Exception:
+                self.__logger.exception('Failed to write statistics to the database.')
+
+    def __init__(self, database: FAQDatabase, interval: float, retention: int = 0) -> None:
+        """
+        Main constructor of FAQStatistics class.
+        :param database: Database for storing statistics.
+        :param interval: Interval between writes in seconds.
+        :param retention: Number of days to keep statistics. Zero means forever.
+        """
+        self.__database = database
+        self.__interval = interval
+        self.__retention = retention
+        self.__pruned = 0
+        self.__period = 3600
+        self.__limit = 10
+        self.__maxlength = 64
+        self.__counters: Dict[Tuple[str, bool], int] = {}
+        self.__lock = threading.Lock()
+        self.__stop = threading.Event()
+        self.__worker = threading.Thread(target=self.__flush_worker, name='faqbot-stats', daemon=True)
+        self.__logger = logging.getLogger(__name__)
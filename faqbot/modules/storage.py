@@ -0,0 +1,150 @@
+# coding=utf-8
+
+# FAQ bot for Telegram Messenger
+# Copyright (c) 2019 - 2020 EasyCoding Team
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import abc
+
+from typing import ContextManager, List, Optional, Sequence, Tuple
+
+
+class FAQRollback(Exception):
+    """
+    Raise inside transaction to discard all its changes.
+    """
+
+
+class FAQCommonStorage(abc.ABC):
+    @abc.abstractmethod
+    def get_value(self, keyword: str, langs: Sequence[str] = ()) -> Optional[str]:
+        """
+        Get value from storage by the specified keyword. Language variants
+        will be tried in order of preference before the default value.
+        :param keyword: Keyword to search.
+        :param langs: Preferred languages.
+        :return: Value from storage or None if not found.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def check_exists(self, keyword: str) -> bool:
+        """
+        Check if the specified keyword exists in storage.
+        :param keyword: Keyword to check.
+        :return: Return True if exists.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def list_keywords(self) -> list:
+        """
+        List all available keywords from storage.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def list_values(self) -> List[Tuple[str, int, str]]:
+        """
+        List all available keywords with internal IDs and values.
+        :return: List of tuples with keyword, internal ID and value.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def add_value(self, keyword: str, value: str) -> None:
+        """
+        Set value for the specified keyword.
+        :param keyword: Keyword to operate with.
+        :param value: New value.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def set_value(self, keyword: str, new_value: str) -> None:
+        """
+        Set value for the specified keyword.
+        :param keyword: Keyword to operate with.
+        :param new_value: New value.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def remove_value(self, keyword: str) -> None:
+        """
+        Remove keyword from storage.
+        :param keyword: Keyword to operate with.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def add_alias(self, keyword: str, new_alias: str) -> None:
+        """
+        Add a new alias for the specified keyword.
+        :param keyword: Keyword to operate with.
+        :param new_alias: New alias.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def remove_alias(self, alias: str) -> None:
+        """
+        Remove alias from storage.
+        :param alias: Alias to operate with.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def set_variant(self, keyword: str, lang: str, value: str) -> None:
+        """
+        Add or change language variant of the specified keyword's value.
+        :param keyword: Keyword to operate with.
+        :param lang: Language code.
+        :param value: Localized value.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def remove_variant(self, keyword: str, lang: str) -> bool:
+        """
+        Remove language variant of the specified keyword's value.
+        :param keyword: Keyword to operate with.
+        :param lang: Language code.
+        :return: Return True if variant was removed.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def list_variants(self) -> List[Tuple[int, str, str]]:
+        """
+        List all language variants with internal IDs of their values.
+        :return: List of tuples with internal ID, language and value.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def transaction(self) -> ContextManager[None]:
+        """
+        Run all changes, made inside this context, in a single transaction.
+        Raising FAQRollback will silently discard all changes.
+        :return: Context manager.
+        """
+        raise NotImplementedError()
+
+    def reload(self) -> None:
+        """
+        Drop cached data and load it again from disk. Does nothing by
+        default.
+        """
@@ -0,0 +1,232 @@
+# coding=utf-8
+
+# FAQ bot for Telegram Messenger
+# Copyright (c) 2019 - 2020 EasyCoding Team
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import hashlib
+import os
+import threading
+
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+
+from .database import FAQDatabase
+from .storage import FAQCommonStorage
+
+
+class FAQSyncResult(NamedTuple):
+    added: int
+    updated: int
+    removed: int
+    unchanged: int
+
+
+class FAQSyncFile(NamedTuple):
+    path: str
+    mtime: int
+    size: int
+    digest: str
+    keywords: List[str]
+    value: str
+
+
+class FAQSync:
+    def run(self, path: str) -> FAQSyncResult:
+        """
+        Synchronize the database with a directory of Markdown files.
+        Files with the same modification time and size are skipped
+        without reading, files with the same content hash are not
+        parsed. All changes are applied in a single transaction.
+        :param path: Full path to directory with Markdown files.
+        :return: Number of added, updated, removed and unchanged files.
+        """
+        if not os.path.isdir(path):
+            raise ValueError('Directory {} does not exist.'.format(path))
+        with self.__lock:
+            state = self.__database.get_sync_state()
+            touched, changed, unchanged = [], [], 0
+            found = set()
+            for relpath, fullpath, stat in self.__scan(path):
+                found.add(relpath)
+                old = state.get(relpath)
+                if old and old[0] == stat.st_mtime_ns and old[1] == stat.st_size:
+                    unchanged += 1
+                    continue
+                with open(fullpath, 'rb') as file:
+                    content = file.read()
+                digest = hashlib.sha256(content).hexdigest()
+                if old and old[2] == digest:
+                    touched.append((relpath, stat.st_mtime_ns, stat.st_size, digest, old[3]))
+                    unchanged += 1
+                    continue
+                keywords, value = self.__parse(relpath, content.decode('utf-8'))
+                changed.append(FAQSyncFile(relpath, stat.st_mtime_ns, stat.st_size, digest, keywords, value))
+            removed = [relpath for relpath in state if relpath not in found]
+            self.__check_conflicts(state, changed, removed)
+            if touched or changed or removed:
+                self.__apply(state, touched, changed, removed)
+        added = sum(1 for item in changed if item.path not in state)
+        return FAQSyncResult(added, len(changed) - added, len(removed), unchanged)
+
+    @staticmethod
+    def __check_conflicts(state: Dict[str, Tuple[int, int, str, List[str]]], changed: List[FAQSyncFile],
+                          removed: List[str]) -> None:
+        """
+        Check that every keyword and alias is defined by a single file
+        after synchronization. Private method.
+        :param state: Saved states of synchronized files.
+        :param changed: Added and modified files.
+        :param removed: Relative paths of removed files.
+        """
+        files = {relpath: value[3] for relpath, value in state.items() if relpath not in removed}
+        files.update((item.path, item.keywords) for item in changed)
+        owners = {}
+        for relpath in sorted(files):
+            for keyword in files[relpath]:
+                if keyword in owners:
+                    raise ValueError('Keyword {} is defined by both {} and {}.'.format(keyword, owners[keyword],
+                                                                                      relpath))
+                owners[keyword] = relpath
+
+    def __apply(self, state: Dict[str, Tuple[int, int, str, List[str]]], touched: List[tuple],
+                changed: List[FAQSyncFile], removed: List[str]) -> None:
+        """
+        Apply changes to the database in a single transaction. Private
+        method.
+        :param state: Saved states of synchronized files.
+        :param touched: States of files with new modification time only.
+        :param changed: Added and modified files.
+        :param removed: Relative paths of removed files.
+        """
+        with self.__storage.transaction():
+            for relpath in removed:
+                self.__remove_keywords(state[relpath][3])
+                self.__database.remove_sync_state(relpath)
+            for item in touched:
+                self.__database.set_sync_state(*item)
+            for item in changed:
+                self.__update_entry(state[item.path][3] if item.path in state else [], item.keywords, item.value)
+                self.__database.set_sync_state(item.path, item.mtime, item.size, item.digest, item.keywords)
+
+    def __update_entry(self, old: List[str], new: List[str], value: str) -> None:
+        """
+        Update a single database entry, described by file: set its value
+        and bring its aliases in line with front matter. Private method.
+        :param old: Keyword and aliases from the previous version of file.
+        :param new: Keyword and aliases from the current version of file.
+        :param value: Keyword's description.
+        """
+        self.__remove_keywords([keyword for keyword in old if keyword not in new])
+        anchor = next((keyword for keyword in new if keyword in old and self.__storage.check_exists(keyword)), None)
+        if not anchor and self.__storage.check_exists(new[0]):
+            anchor = new[0]
+        if anchor:
+            self.__storage.set_value(anchor, value)
+        else:
+            anchor = new[0]
+            self.__storage.add_value(anchor, value)
+        for keyword in new:
+            if keyword == anchor or keyword in old and self.__storage.check_exists(keyword):
+                continue
+            if self.__storage.check_exists(keyword):
+                self.__storage.remove_alias(keyword)
+            self.__storage.add_alias(anchor, keyword)
+
+    def __remove_keywords(self, keywords: List[str]) -> None:
+        """
+        Remove keywords and aliases, which no longer exist in files.
+        Values without keywords will be removed automatically. Private
+        method.
+        :param keywords: Keywords to remove.
+        """
+        for keyword in keywords:
+            if self.__storage.check_exists(keyword):
+                self.__storage.remove_alias(keyword)
+
+    @staticmethod
+    def __scan(path: str) -> Iterator[Tuple[str, str, os.stat_result]]:
+        """
+        Recursively find all Markdown files in directory. Hidden files
+        and directories are ignored. Private method.
+        :param path: Full path to directory.
+        :return: Relative path, full path and stat result of each file.
+        """
+        directories = ['']
+        while directories:
+            current = directories.pop()
+            with os.scandir(os.path.join(path, current)) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.'):
+                        continue
+                    relpath = os.path.join(current, entry.name)
+                    if entry.is_dir():
+                        directories.append(relpath)
+                    elif entry.is_file() and entry.name.endswith('.md'):
+                        yield relpath.replace(os.sep, '/'), entry.path, entry.stat()
+
+    @staticmethod
+    def __parse_list(value: str) -> List[str]:
+        """
+        Parse inline list of front matter, e.g. [a, b] or a, b. Private
+        method.
+        :param value: Raw value.
+        :return: List of items.
+        """
+        value = value.strip()
+        if value.startswith('[') and value.endswith(']'):
+            value = value[1:-1]
+        return [item.strip().strip('\'"') for item in value.split(',') if item.strip()]
+
+    def __parse(self, relpath: str, content: str) -> Tuple[List[str], str]:
+        """
+        Parse Markdown file with front matter. Keyword defaults to the
+        file name if not specified. Private method.
+        :param relpath: Relative path to file.
+        :param content: File contents.
+        :return: List with keyword and aliases, and keyword's description.
+        """
+        meta, current = {}, None
+        lines = content.lstrip('\ufeff').splitlines()
+        if lines and lines[0].strip() == '---':
+            try:
+                end = lines.index('---', 1)
+            except ValueError:
+                raise ValueError('File {} has unterminated front matter.'.format(relpath))
+            for line in lines[1:end]:
+                if line.lstrip().startswith('- ') and current:
+                    meta[current].append(line.lstrip()[2:].strip().strip('\'"'))
+                elif ':' in line:
+                    current, value = (item.strip() for item in line.split(':', 1))
+                    meta[current] = self.__parse_list(value)
+            lines = lines[end + 1:]
+        value = '\n'.join(lines).strip()
+        keyword = meta.get('keyword') or [os.path.splitext(os.path.basename(relpath))[0]]
+        keywords = list(dict.fromkeys(keyword[:1] + meta.get('aliases', [])))
+        if not value:
+            raise ValueError('File {} has no description.'.format(relpath))
+        if any(not item or any(char.isspace() for char in item) for item in keywords):
+            raise ValueError('File {} has invalid keyword or alias.'.format(relpath))
+        return keywords, value
+
+    def __init__(self, storage: FAQCommonStorage, database: FAQDatabase) -> None:
+        """
+        Main constructor of FAQSync class.
+        :param storage: Storage, used to modify keywords.
+        :param database: Database, used to save states of synchronized files.
+        """
+        self.__storage = storage
+        self.__database = database
+        self.__lock = threading.Lock()
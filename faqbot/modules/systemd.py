@@ -0,0 +1,115 @@
+# coding=utf-8
+
+# FAQ bot for Telegram Messenger
+# Copyright (c) 2019 - 2020 EasyCoding Team
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import socket
+import threading
+import time
+
+
+class FAQNotifier:
+    @property
+    def watchdog(self) -> float:
+        """
+        Get systemd watchdog timeout in seconds.
+        :return: Watchdog timeout or zero if watchdog is disabled.
+        """
+        return self.__watchdog
+
+    def notify(self, *states: str) -> None:
+        """
+        Send notification to systemd. Does nothing if bot is not
+        running as a notify service.
+        :param states: Notification states, e.g. READY=1.
+        """
+        if not self.__address:
+            return
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.sendto('\n'.join(states).encode('utf-8'), self.__address)
+
+    def ready(self) -> None:
+        """
+        Notify systemd that bot has been started and ready to serve.
+        """
+        self.notify('READY=1', 'STATUS=Serving requests.')
+
+    def heartbeat(self, processed: int) -> None:
+        """
+        Count processed updates and send watchdog ping. Ping is sent on
+        every call, because the next one can be delayed by a long polling
+        timeout. Current throughput is reported once per interval.
+        :param processed: Number of updates, processed since the previous call.
+        """
+        self.__processed += processed
+        now = time.monotonic()
+        elapsed = now - self.__pinged
+        if elapsed < self.__interval:
+            self.notify('WATCHDOG=1')
+            return
+        self.notify('WATCHDOG=1', 'STATUS=Serving requests, {:.2f} updates/s, {} updates total.'.format(
+            (self.__processed - self.__reported) / elapsed, self.__processed))
+        self.__reported = self.__processed
+        self.__pinged = now
+
+    def sleep(self, timeout: float, stop: threading.Event) -> None:
+        """
+        Sleep for the specified time, sending watchdog pings meanwhile.
+        :param timeout: Time in seconds.
+        :param stop: Event, which interrupts sleep when set.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            self.heartbeat(0)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or stop.wait(min(remaining, self.__interval)):
+                break
+
+    def __get_address(self) -> str:
+        """
+        Get systemd notification socket address from environment.
+        Private method.
+        :return: Socket address or empty string if not available.
+        """
+        address = os.getenv('NOTIFY_SOCKET', '')
+        if not hasattr(socket, 'AF_UNIX'):
+            return ''
+        return '\0{}'.format(address[1:]) if address.startswith('@') else address
+
+    def __get_watchdog(self) -> float:
+        """
+        Get systemd watchdog timeout from environment. Private method.
+        :return: Watchdog timeout in seconds or zero if disabled.
+        """
+        try:
+            watchdog_pid = os.getenv('WATCHDOG_PID')
+            if watchdog_pid and int(watchdog_pid) != os.getpid():
+                return 0.0
+            return int(os.getenv('WATCHDOG_USEC', '0')) / 1000000
+        except ValueError:
+            return 0.0
+
+    def __init__(self) -> None:
+        """
+        Main constructor of FAQNotifier class.
+        """
+        self.__address = self.__get_address()
+        self.__watchdog = self.__get_watchdog()
+        self.__interval = self.__watchdog / 2 if self.__watchdog else 10.0
+        self.__processed = 0
+        self.__reported = 0
+        self.__pinged = time.monotonic()
@@ -0,0 +1,99 @@
+# coding=utf-8
+
+# FAQ bot for Telegram Messenger
+# Copyright (c) 2019 - 2020 EasyCoding Team
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Hashable
+
+
+class FAQThrottle:
+    def acquire(self, key: Hashable) -> bool:
+        """
+        Take a token from the bucket of the specified key.
+        :param key: User or chat ID.
+        :return: True if request is allowed.
+        """
+        if not self.__rate:
+            return True
+        now = time.monotonic()
+        with self.__lock:
+            self.__expire(now)
+            tokens, stamp, notified = self.__buckets.pop(key, (self.__burst, now, False))
+            tokens = min(self.__burst, tokens + (now - stamp) * self.__rate)
+            allowed = tokens >= 1.0
+            if allowed:
+                tokens -= 1.0
+                notified = False
+            self.__buckets[key] = tokens, now, notified
+        return allowed
+
+    def release(self, key: Hashable) -> None:
+        """
+        Return the token, taken by acquire, to the bucket of the specified
+        key. Used when request was denied by another limit.
+        :param key: User or chat ID.
+        """
+        if not self.__rate:
+            return
+        with self.__lock:
+            bucket = self.__buckets.get(key)
+            if bucket:
+                self.__buckets[key] = min(self.__burst, bucket[0] + 1.0), bucket[1], bucket[2]
+
+    def notify(self, key: Hashable) -> bool:
+        """
+        Check if cooldown notice should be sent for the specified key.
+        It will be sent only once until the next allowed request.
+        :param key: User or chat ID.
+        :return: True if notice should be sent.
+        """
+        with self.__lock:
+            bucket = self.__buckets.get(key)
+            if not bucket or bucket[2]:
+                return False
+            self.__buckets[key] = bucket[0], bucket[1], True
+        return True
+
+    def __expire(self, now: float) -> None:
+        """
+        Remove buckets, which are fully refilled and therefore equal to
+        the new ones. The oldest buckets will also be removed if their
+        number exceeds the limit. Private method.
+        :param now: Current time.
+        """
+        while self.__buckets:
+            key = next(iter(self.__buckets))
+            if now - self.__buckets[key][1] < self.__lifetime and len(self.__buckets) < self.__size:
+                break
+            self.__buckets.popitem(last=False)
+
+    def __init__(self, rate: float, burst: int, size: int) -> None:
+        """
+        Main constructor of FAQThrottle class.
+        :param rate: Allowed number of requests per minute. Zero disables throttling.
+        :param burst: Maximum number of requests in a row.
+        :param size: Maximum number of tracked keys.
+        """
+        self.__rate = rate / 60.0
+        self.__burst = max(burst, 1)
+        self.__size = max(size, 1)
+        self.__lifetime = self.__burst / self.__rate if self.__rate else 0.0
+        self.__buckets = OrderedDict()
+        self.__lock = threading.Lock()
@@ -0,0 +1,106 @@
+# coding=utf-8
+
+# FAQ bot for Telegram Messenger
+# Copyright (c) 2019 - 2020 EasyCoding Team
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import requests
+import telebot
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class FAQTransport:
+    @property
+    def poolsize(self) -> int:
+        """
+        Get maximum number of persistent connections per host.
+        :return: Connection pool size.
+        """
+        return self.__poolsize
+
+    def install(self) -> None:
+        """
+        Replace default per-thread sessions of TeleBot library with
+        a single shared session and set connection timeouts.
+        """
+        telebot.apihelper.session = self.__session
+        telebot.apihelper._get_req_session = self.__get_session
+        telebot.apihelper.CONNECT_TIMEOUT = self.__connect_timeout
+        telebot.apihelper.READ_TIMEOUT = self.__read_timeout
+
+    def get_stats(self) -> dict:
+        """
+        Get connection reuse statistics of all connection pools.
+        :return: Number of requests, opened connections and reuse ratio.
+        """
+        requests_total = connections_total = 0
+        pools = self.__adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                requests_total += pool.num_requests
+                connections_total += pool.num_connections
+        reused = max(requests_total - connections_total, 0)
+        return {'requests': requests_total, 'connections': connections_total,
+                'reuse': reused / requests_total if requests_total else 0.0}
+
+    def close(self) -> None:
+        """
+        Close all persistent connections.
+        """
+        self.__session.close()
+
+    def __get_session(self, reset: bool = False) -> requests.Session:
+        """
+        Get shared session. Used instead of per-thread sessions of
+        TeleBot library. Private method.
+        :param reset: Ignored, kept for compatibility.
+        :return: Shared session.
+        """
+        return self.__session
+
+    def __create_session(self, retries: int) -> None:
+        """
+        Create shared keep-alive session. Only connection errors and
+        idempotent requests (e.g. getUpdates) are retried, so messages
+        will never be sent twice. Read timeouts are never retried,
+        because a single long polling request can already last longer
+        than the watchdog interval. Private method.
+        :param retries: Maximum number of retries.
+        """
+        retry = Retry(total=retries, read=0, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504),
+                      raise_on_status=False)
+        self.__adapter = HTTPAdapter(pool_connections=2, pool_maxsize=self.__poolsize,
+                                     max_retries=retry)
+        self.__session = requests.Session()
+        self.__session.mount('https://', self.__adapter)
+        self.__session.mount('http://', self.__adapter)
+
+    def __init__(self, poolsize: int, connect_timeout: float, read_timeout: float, retries: int) -> None:
+        """
+        Main constructor of FAQTransport class.
+        :param poolsize: Maximum number of persistent connections per host.
+        :param connect_timeout: Connection timeout in seconds.
+        :param read_timeout: Read timeout in seconds. Long polling requests
+        always use their own timeout.
+        :param retries: Maximum number of retries on connection errors.
+        """
+        self.__poolsize = max(poolsize, 1)
+        self.__connect_timeout = connect_timeout
+        self.__read_timeout = read_timeout
+        self.__create_session(retries)
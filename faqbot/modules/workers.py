@@ -0,0 +1,186 @@
+# coding=utf-8
+
+# FAQ bot for Telegram Messenger
+# Copyright (c) 2019 - 2020 EasyCoding Team
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import logging
+import queue
+import threading
+import time
+
+from typing import Callable
+
+
+class FAQLane:
+    @property
+    def depth(self) -> int:
+        """
+        Get current number of queued tasks.
+        :return: Queue depth.
+        """
+        return self.__queue.qsize()
+
+    def submit(self, task: Callable, *args) -> bool:
+        """
+        Put task to the queue without blocking.
+        :param task: Function to run.
+        :param args: Function arguments.
+        :return: False if queue is full and task was rejected.
+        """
+        try:
+            self.__queue.put_nowait((time.monotonic(), task, args))
+        except queue.Full:
+            with self.__lock:
+                self.__rejected += 1
+            return False
+        with self.__lock:
+            self.__maxdepth = max(self.__maxdepth, self.__queue.qsize())
+        return True
+
+    def get_stats(self, reset: bool = False) -> dict:
+        """
+        Get queue depth and wait time statistics.
+        :param reset: Reset collected statistics.
+        :return: Statistics of the lane.
+        """
+        with self.__lock:
+            result = {'depth': self.depth, 'maxdepth': self.__maxdepth, 'processed': self.__processed,
+                      'rejected': self.__rejected, 'avgwait': self.__waited / self.__processed if self.__processed else 0.0,
+                      'maxwait': self.__maxwait}
+            if reset:
+                self.__maxdepth = self.__processed = self.__rejected = 0
+                self.__waited = self.__maxwait = 0.0
+        return result
+
+    def start(self) -> None:
+        """
+        Start worker threads.
+        """
+        for number in range(self.__count):
+            worker = threading.Thread(target=self.__worker, name='{}-{}'.format(self.__name, number), daemon=True)
+            worker.start()
+            self.__threads.append(worker)
+
+    def stop(self) -> None:
+        """
+        Stop worker threads after all queued tasks are finished.
+        """
+        for _ in self.__threads:
+            self.__queue.put(None)
+        for worker in self.__threads:
+            worker.join()
+        self.__threads.clear()
+
+    def __worker(self) -> None:
+        """
+        Take tasks from the queue and run them until sentinel is
+        received. Private method.
+        """
+        while True:
+            item = self.__queue.get()
+            if item is None:
+                break
+            queued, task, args = item
+            waited = time.monotonic() - queued
+            with self.__lock:
+                self.__processed += 1
+                self.__waited += waited
+                self.__maxwait = max(self.__maxwait, waited)
+            try:
+                task(*args)
+            except Exception:
+                self.__logger.exception('Unhandled exception in %s worker.', self.__name)
+
+    def __init__(self, name: str, count: int, size: int) -> None:
+        """
+        Main constructor of FAQLane class.
+        :param name: Lane name.
+        :param count: Number of worker threads.
+        :param size: Maximum number of queued tasks. Zero means unlimited.
+        """
+        self.__name = name
+        self.__count = max(count, 1)
+        self.__queue = queue.Queue(size)
+        self.__threads = []
+        self.__lock = threading.Lock()
+        self.__logger = logging.getLogger(__name__)
+        self.__maxdepth = self.__processed = self.__rejected = 0
+        self.__waited = self.__maxwait = 0.0
+
+
+class FAQWorkers:
+    def submit(self, task: Callable, *args, admin: bool = False) -> bool:
+        """
+        Put task to the queue of the user or admin lane without blocking.
+        :param task: Function to run.
+        :param args: Function arguments.
+        :param admin: Use admin lane.
+        :return: False if queue is full and task was rejected.
+        """
+        return (self.__admin if admin else self.__users).submit(task, *args)
+
+    def notify(self, task: Callable, *args) -> bool:
+        """
+        Put task, sending a short notice (e.g. about rejected command), to
+        the queue of the notice lane without blocking. Notices are shed
+        if this queue is full too.
+        :param task: Function to run.
+        :param args: Function arguments.
+        :return: False if queue is full and task was rejected.
+        """
+        return self.__notices.submit(task, *args)
+
+    def get_stats(self, reset: bool = False) -> dict:
+        """
+        Get queue statistics of both lanes.
+        :param reset: Reset collected statistics.
+        :return: Statistics of user, admin and notice lanes.
+        """
+        return {name: lane.get_stats(reset) for name, lane in self.__lanes.items()}
+
+    def start(self) -> None:
+        """
+        Start worker threads of all lanes.
+        """
+        for lane in self.__lanes.values():
+            lane.start()
+
+    def stop(self) -> None:
+        """
+        Finish queued tasks and stop worker threads of all lanes.
+        """
+        for lane in self.__lanes.values():
+            lane.stop()
+
+    def __init__(self, workers: int, size: int, adminworkers: int, serial: bool = False) -> None:
+        """
+        Main constructor of FAQWorkers class.
+        :param workers: Number of worker threads for user commands.
+        :param size: Maximum number of queued user commands.
+        :param adminworkers: Number of worker threads for admin commands.
+        :param serial: Run all commands by a single worker thread in order
+        of arrival. Queue size is not limited in this mode.
+        """
+        if serial:
+            self.__users = self.__admin = FAQLane('worker', 1, 0)
+            self.__lanes = {'users': self.__users}
+        else:
+            self.__users = FAQLane('worker', workers, max(size, 1))
+            self.__admin = FAQLane('admin', adminworkers, max(size, 1))
+            self.__lanes = {'users': self.__users, 'admin': self.__admin}
+        self.__notices = FAQLane('notice', 1, 10)
+        self.__lanes['notices'] = self.__notices
@@ -0,0 +1,61 @@
+# coding=utf-8
+
+# FAQ bot for Telegram Messenger
+# Copyright (c) 2019 - 2020 EasyCoding Team
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import argparse
+
+from faqbot.modules.backup import FAQBackup
+from faqbot.settings import Settings
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Create, list and restore FAQ bot database backups.')
+    subparsers = parser.add_subparsers(dest='action')
+    subparsers.add_parser('create', help='create an online backup of the database')
+    subparsers.add_parser('list', help='list available backups')
+    restore = subparsers.add_parser('restore', help='restore the database from backup (stop the bot first)')
+    restore.add_argument('backup', help='full path to backup file or its name in backups directory')
+    args = parser.parse_args()
+    if not args.action:
+        parser.error('action is required')
+    return args
+
+
+def main():
+    try:
+        # Parsing command-line arguments...
+        args = parse_args()
+        settings = Settings(1)
+        backup = FAQBackup(settings.database_file, settings.backup_path, settings.backupcount,
+                           settings.backupcompress, settings.backupinterval)
+
+        # Running requested action...
+        if args.action == 'create':
+            print(backup.create())
+        elif args.action == 'list':
+            print('\n'.join(backup.list_backups()))
+        elif args.action == 'restore':
+            matches = [fname for fname in backup.list_backups() if fname.endswith(args.backup)]
+            backup.restore(matches[-1] if matches else args.backup)
+
+    except Exception as ex:
+        # Exception detected...
+        print('An error occurred while running backup tool! Inner message: {}'.format(ex))
+
+
+if __name__ == '__main__':
+    main()
@@ -56,6 +56,235 @@ class Settings:
         """
         return self.__data['logfilefmt']
 
+    @property
+    def logjson(self) -> bool:
+        """
+        Get whether logs should be written as structured JSON objects
+        instead of using logfilefmt and stderrfmt formatters.
+        :return: Use JSON formatter.
+        """
+        return self.__data.get('logjson', False)
+
+    @property
+    def logqueue(self) -> int:
+        """
+        Get maximum number of log records, waiting to be written. Extra
+        records will be dropped.
+        :return: Logging queue size.
+        """
+        return self.__data.get('logqueue', 10000)
+
+    @property
+    def statsinterval(self) -> int:
+        """
+        Get interval in seconds between writes of lookup statistics
+        to the database.
+        :return: Statistics write interval.
+        """
+        return self.__data.get('statsinterval', 60)
+
+    @property
+    def statsretention(self) -> int:
+        """
+        Get number of days to keep lookup statistics in the database.
+        :return: Statistics retention period.
+        """
+        return self.__data.get('statsretention', 30)
+
+    @property
+    def userrate(self) -> float:
+        """
+        Get number of public commands per minute, allowed for each user.
+        Zero disables per-user throttling.
+        :return: Per-user rate limit.
+        """
+        return self.__data.get('userrate', 20)
+
+    @property
+    def userburst(self) -> int:
+        """
+        Get number of public commands, which each user can send in a row.
+        :return: Per-user burst limit.
+        """
+        return self.__data.get('userburst', 5)
+
+    @property
+    def chatrate(self) -> float:
+        """
+        Get number of public commands per minute, allowed for each chat.
+        Zero disables per-chat throttling.
+        :return: Per-chat rate limit.
+        """
+        return self.__data.get('chatrate', 60)
+
+    @property
+    def chatburst(self) -> int:
+        """
+        Get number of public commands, which can be sent in a row to each chat.
+        :return: Per-chat burst limit.
+        """
+        return self.__data.get('chatburst', 20)
+
+    @property
+    def floodnotice(self) -> bool:
+        """
+        Get whether a single cooldown notice should be sent when user or
+        chat exceeds the limit. Otherwise extra commands will be silently
+        ignored.
+        :return: Send cooldown notice.
+        """
+        return self.__data.get('floodnotice', True)
+
+    @property
+    def floodsize(self) -> int:
+        """
+        Get maximum number of users and chats, tracked by the throttler.
+        :return: Throttler size.
+        """
+        return self.__data.get('floodsize', 100000)
+
+    @property
+    def compressthreshold(self) -> int:
+        """
+        Get minimum size of keyword's description in bytes to be stored
+        compressed. Zero disables compression.
+        :return: Compression threshold.
+        """
+        return self.__data.get('compressthreshold', 0)
+
+    @property
+    def cachesize(self) -> int:
+        """
+        Get maximum number of resolved descriptions to cache.
+        :return: Cache size.
+        """
+        return self.__data.get('cachesize', 256)
+
+    @property
+    def maintinterval(self) -> int:
+        """
+        Get interval in seconds between database maintenance runs.
+        Zero disables background maintenance.
+        :return: Maintenance interval.
+        """
+        return self.__data.get('maintinterval', 3600)
+
+    @property
+    def analyzechanges(self) -> int:
+        """
+        Get number of keyword and value changes, required to run ANALYZE.
+        :return: ANALYZE threshold.
+        """
+        return self.__data.get('analyzechanges', 100)
+
+    @property
+    def vacuumratio(self) -> float:
+        """
+        Get ratio of free database pages, required to run VACUUM.
+        :return: VACUUM threshold.
+        """
+        return self.__data.get('vacuumratio', 0.2)
+
+    @property
+    def backupinterval(self) -> int:
+        """
+        Get interval in seconds between scheduled database backups.
+        Zero disables scheduled backups.
+        :return: Backup interval.
+        """
+        return self.__data.get('backupinterval', 86400)
+
+    @property
+    def backupcount(self) -> int:
+        """
+        Get number of database backups to keep.
+        :return: Number of backups.
+        """
+        return self.__data.get('backupcount', 7)
+
+    @property
+    def backupcompress(self) -> bool:
+        """
+        Get whether database backups should be compressed using gzip.
+        :return: Compress backups.
+        """
+        return self.__data.get('backupcompress', True)
+
+    @property
+    def draintimeout(self) -> float:
+        """
+        Get maximum time in seconds to wait for in-flight commands on
+        shutdown.
+        :return: Drain timeout.
+        """
+        return self.__data.get('draintimeout', 20)
+
+    @property
+    def autocooldown(self) -> int:
+        """
+        Get minimum interval in seconds between automatic answers with
+        the same keyword in a single chat.
+        :return: Cooldown period.
+        """
+        return self.__data.get('autocooldown', 600)
+
+    @property
+    def workers(self) -> int:
+        """
+        Get number of worker threads, handling user commands.
+        :return: Number of workers.
+        """
+        return self.__data.get('workers', 4)
+
+    @property
+    def adminworkers(self) -> int:
+        """
+        Get number of worker threads, handling admin commands.
+        :return: Number of admin workers.
+        """
+        return self.__data.get('adminworkers', 1)
+
+    @property
+    def queuesize(self) -> int:
+        """
+        Get maximum number of commands, waiting for a free worker.
+        :return: Queue size.
+        """
+        return self.__data.get('queuesize', 100)
+
+    @property
+    def poolsize(self) -> int:
+        """
+        Get maximum number of persistent connections to Telegram API.
+        Zero means the total number of workers plus two.
+        :return: Connection pool size.
+        """
+        return self.__data.get('poolsize', 0)
+
+    @property
+    def connecttimeout(self) -> float:
+        """
+        Get Telegram API connection timeout in seconds.
+        :return: Connection timeout.
+        """
+        return self.__data.get('connecttimeout', 5)
+
+    @property
+    def readtimeout(self) -> float:
+        """
+        Get Telegram API read timeout in seconds.
+        :return: Read timeout.
+        """
+        return self.__data.get('readtimeout', 30)
+
+    @property
+    def retries(self) -> int:
+        """
+        Get maximum number of retries of failed Telegram API requests.
+        :return: Number of retries.
+        """
+        return self.__data.get('retries', 3)
+
     @property
     def faqlink(self) -> str:
         """
@@ -88,6 +317,57 @@ class Settings:
         """
         return str(os.path.join(self.__get_data_path(), '{}.db'.format(self.__appname)))
 
+    @property
+    def storage(self) -> str:
+        """
+        Get storage backend name: sqlite or snapshot.
+        :return: Storage backend name.
+        """
+        return self.__data.get('storage', 'sqlite')
+
+    @property
+    def snapshot_file(self) -> str:
+        """
+        Get fully-qualified path to read-only snapshot file.
+        :return: Fully-qualified path to snapshot file.
+        """
+        return str(os.path.join(self.__get_data_path(), '{}.snap'.format(self.__appname)))
+
+    @property
+    def backup_path(self) -> str:
+        """
+        Get fully-qualified path to directory for database backups.
+        :return: Fully-qualified path to backups directory.
+        """
+        return str(os.path.join(self.__get_data_path(), 'backups'))
+
+    @property
+    def sync_path(self) -> str:
+        """
+        Get fully-qualified path to directory with Markdown files for
+        synchronization. Relative paths are resolved against the data
+        directory.
+        :return: Fully-qualified path or empty string if not configured.
+        """
+        syncdir = self.__data.get('syncdir', '')
+        return str(os.path.join(self.__get_data_path(), syncdir)) if syncdir else ''
+
+    @property
+    def capture_path(self) -> str:
+        """
+        Get fully-qualified path to directory for traffic captures.
+        :return: Fully-qualified path to captures directory.
+        """
+        return str(os.path.join(self.__get_data_path(), 'captures'))
+
+    @property
+    def profile_path(self) -> str:
+        """
+        Get fully-qualified path to directory for profiling results.
+        :return: Fully-qualified path to profiling results directory.
+        """
+        return str(os.path.join(self.__get_data_path(), 'profiles'))
+
     def save(self) -> None:
         """
         Save current settings to JSON file.
@@ -151,6 +431,76 @@ class Settings:
             pass
         return logging.INFO
 
+    @staticmethod
+    def get_profiling_enabled() -> bool:
+        """
+        Get whether profiling should be enabled on startup. User can
+        override this setting by exporting PROFILE environment option.
+        :return: Profiling status.
+        """
+        return os.getenv('PROFILE', '').lower() in ('1', 'true', 'yes', 'on')
+
+    @staticmethod
+    def get_recording_enabled() -> bool:
+        """
+        Get whether incoming updates should be recorded. User can
+        enable recording by exporting RECORD environment option.
+        :return: Recording status.
+        """
+        return os.getenv('RECORD', '').lower() in ('1', 'true', 'yes', 'on')
+
+    @staticmethod
+    def get_serial_enabled() -> bool:
+        """
+        Get whether all commands should be handled one by one in order of
+        arrival without throttling. User can enable this mode by exporting
+        SERIAL environment option.
+        :return: Serial mode status.
+        """
+        return os.getenv('SERIAL', '').lower() in ('1', 'true', 'yes', 'on')
+
+    @staticmethod
+    def __get_numeric_env(name: str, default: float) -> float:
+        """
+        Get numeric value of environment option. Private method.
+        :param name: Environment option name.
+        :param default: Default value.
+        :return: Numeric value.
+        """
+        try:
+            value = os.getenv(name)
+            if value:
+                return float(value)
+        except ValueError:
+            pass
+        return default
+
+    def get_profiling_rate(self) -> int:
+        """
+        Get profiling sample rate. Every N-th call of each handler will
+        be profiled. User can override this setting by exporting
+        PROFILERATE environment option.
+        :return: Sample rate.
+        """
+        return int(self.__get_numeric_env('PROFILERATE', 100))
+
+    def get_profiling_interval(self) -> float:
+        """
+        Get interval between memory snapshots in seconds. User can
+        override this setting by exporting PROFILEINTERVAL environment
+        option.
+        :return: Snapshots interval.
+        """
+        return self.__get_numeric_env('PROFILEINTERVAL', 300.0)
+
+    def get_slow_query_threshold(self) -> float:
+        """
+        Get slow query threshold in milliseconds. User can override this
+        setting by exporting SLOWQUERY environment option.
+        :return: Slow query threshold.
+        """
+        return self.__get_numeric_env('SLOWQUERY', 100.0)
+
     def __find_cfgfile(self) -> None:
         """
         Get fully-qualified path to main configuration file.
@@ -76,6 +76,7 @@ exit 0
 %license LICENSE
 %doc README.md doxyout/html
 %{_bindir}/%{name}
+%{_bindir}/%{name}-backup
 %{python3_sitelib}/%{name}
 %{python3_sitelib}/%{name}-*.egg-info
 %dir %{_sysconfdir}/%{name}
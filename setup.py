@@ -29,6 +29,7 @@ setup(
     entry_points={
         'console_scripts': [
             'faqbot = faqbot.scripts.runbot:main',
+            'faqbot-backup = faqbot.scripts.backup:main',
         ],
     },
     license='GPLv3',